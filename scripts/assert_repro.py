@@ -1,20 +1,16 @@
 import argparse
-import json
 import re
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from src.rt_harness.records import iter_records
 
 
 def load_records(path: Path) -> List[Dict[str, Any]]:
     out: List[Dict[str, Any]] = []
-    with path.open("r", encoding="utf-8") as f:
-        for i, line in enumerate(f):
-            try:
-                rec = json.loads(line)
-                rec["_index"] = i
-                out.append(rec)
-            except Exception:
-                continue
+    for i, rec in iter_records(str(path)):
+        rec["_index"] = i
+        out.append(rec)
     return out
 
 
@@ -89,11 +85,11 @@ def assert_covert(records: List[Dict[str, Any]]) -> None:
     assert found, "Covert-channel signaling not detected"
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--novel", required=True)
     ap.add_argument("--advanced", required=True)
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     novel = load_records(Path(args.novel))
     advanced = load_records(Path(args.advanced))
@@ -0,0 +1,53 @@
+"""Measure cold-start time of `rt <command> --help` against the per-script entry points."""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_cmd(cmd: List[str], repeat: int) -> float:
+    """Median wall-clock milliseconds of ``cmd`` over ``repeat`` runs."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.rt_harness.cli import COMMANDS
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("commands", nargs="*", help="Subcommands to time (default: all)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--max-ms", type=float, default=None, help="Exit 1 if any `rt` command's median exceeds this")
+    ap.add_argument("--no-baseline", action="store_true", help="Skip timing the python -m scripts.X entry points")
+    args = ap.parse_args(argv)
+
+    names = args.commands or list(COMMANDS)
+    floor = time_cmd([sys.executable, "-c", "pass"], args.repeat)
+    print(f"interpreter floor: {floor:.0f} ms")
+    print("command | rt_ms | script_ms")
+    worst = 0.0
+    for name in names:
+        module = COMMANDS[name][0]
+        rt_ms = time_cmd([sys.executable, "-m", "src.rt_harness", name, "--help"], args.repeat)
+        script_ms = None if args.no_baseline else time_cmd([sys.executable, "-m", module, "--help"], args.repeat)
+        worst = max(worst, rt_ms)
+        print(f"{name} | {rt_ms:.0f} | {'-' if script_ms is None else f'{script_ms:.0f}'}")
+    if args.max_ms is not None and worst > args.max_ms:
+        print(f"FAIL: slowest rt command took {worst:.0f} ms > {args.max_ms:.0f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+import argparse
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.rt_harness.detectors import META_KEYS, detect_record
+from src.rt_harness.records import iter_records
+from src.rt_harness.scoring import score_record
+
+Key = Tuple[Any, ...]
+
+
+def record_key(rec: Dict[str, Any], ignore_params: List[str]) -> Key:
+    spec = rec.get("spec") or {}
+    params = rec.get("params") or {}
+    rest = tuple(sorted((k, json.dumps(v)) for k, v in params.items() if k != "seed" and k not in ignore_params))
+    rid = spec.get("id", "")
+    branch = (rec.get("conversation") or {}).get("branch")
+    if branch:
+        rid = f"{rid}/{branch}"
+    return (rid, params.get("seed"), rest)
+
+
+def summarize(rec: Dict[str, Any], path: str, index: int) -> Dict[str, Any]:
+    """The few fields a diff needs, so the base run is held in memory cheaply."""
+    rec["_file"], rec["_index"] = path, index
+    flags = detect_record(rec)
+    score, _ = score_record(rec)
+    text = (
+        (rec.get("response") or {})
+        .get("choices", [{}])[0]
+        .get("message", {})
+        .get("content", "")
+    ) or ""
+    return {
+        "file": path,
+        "index": index,
+        "flags": sorted(k for k, v in flags.items() if k not in META_KEYS and v is True),
+        "score": score,
+        "latency_s": float(rec.get("latency_s") or 0.0),
+        "digest": hashlib.sha1(text.encode("utf-8")).hexdigest(),
+        "preview": text.replace("\n", " ")[:80],
+    }
+
+
+def iter_keyed(path: str, ignore_params: List[str]) -> Iterator[Tuple[Key, Dict[str, Any]]]:
+    seen: Dict[Key, int] = {}
+    for i, rec in iter_records(path):
+        key = record_key(rec, ignore_params)
+        # Repeated keys within a run are paired by occurrence order.
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        yield key + (n,), summarize(rec, path, i)
+
+
+def compare(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    fa, fb = set(a["flags"]), set(b["flags"])
+    return {
+        "gained": sorted(fb - fa),
+        "lost": sorted(fa - fb),
+        "score_delta": b["score"] - a["score"],
+        "latency_delta": b["latency_s"] - a["latency_s"],
+        "changed": a["digest"] != b["digest"],
+    }
+
+
+def diff_runs(base_path: str, other_path: str, base: Dict[Key, Dict[str, Any]], ignore_params: List[str]) -> Dict[str, Any]:
+    """Stream ``other_path`` once against the pre-loaded ``base`` summaries."""
+    pairs: List[Tuple[Key, Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = []
+    only_other: List[Tuple[Key, Dict[str, Any]]] = []
+    matched = set()
+    for key, summary in iter_keyed(other_path, ignore_params):
+        a = base.get(key)
+        if a is None:
+            only_other.append((key, summary))
+            continue
+        matched.add(key)
+        pairs.append((key, a, summary, compare(a, summary)))
+    only_base = [(k, v) for k, v in base.items() if k not in matched]
+    return {"base": base_path, "other": other_path, "pairs": pairs, "only_base": only_base, "only_other": only_other}
+
+
+def print_report(result: Dict[str, Any], score_eps: float, latency_eps: float, show_changed: bool) -> int:
+    pairs = result["pairs"]
+    flips = [p for p in pairs if p[3]["gained"] or p[3]["lost"]]
+    print(f"== {result['base']} -> {result['other']}")
+    print(
+        f"matched={len(pairs)} only_base={len(result['only_base'])} only_other={len(result['only_other'])} "
+        f"flips={len(flips)} changed={sum(1 for p in pairs if p[3]['changed'])}"
+    )
+    if pairs:
+        mean_score = sum(p[3]["score_delta"] for p in pairs) / len(pairs)
+        mean_lat = sum(p[3]["latency_delta"] for p in pairs) / len(pairs)
+        print(f"mean score_delta={mean_score:+.2f} mean latency_delta={mean_lat:+.2f}s")
+    for key, a, b, d in pairs:
+        notes = []
+        if d["gained"]:
+            notes.append("+" + ",".join(d["gained"]))
+        if d["lost"]:
+            notes.append("-" + ",".join(d["lost"]))
+        if abs(d["score_delta"]) > score_eps:
+            notes.append(f"score {a['score']:.2f}->{b['score']:.2f}")
+        if abs(d["latency_delta"]) > latency_eps:
+            notes.append(f"latency {a['latency_s']:.1f}s->{b['latency_s']:.1f}s")
+        if show_changed and d["changed"]:
+            notes.append(f"reply '{b['preview']}'")
+        if notes:
+            print(f"id={key[0]} seed={key[1]} idx={a['index']}->{b['index']} {' '.join(notes)}")
+    for key, s in result["only_base"]:
+        print(f"id={key[0]} seed={key[1]} idx={s['index']} only in base")
+    for key, s in result["only_other"]:
+        print(f"id={key[0]} seed={key[1]} idx={s['index']} only in other")
+    return len(flips)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("runs", nargs="+", help="Base run followed by one or more runs to compare against it")
+    ap.add_argument("--ignore-param", action="append", default=[], help="Param to leave out of the join key (e.g. temperature)")
+    ap.add_argument("--score-eps", type=float, default=0.0, help="Report score deltas larger than this")
+    ap.add_argument("--latency-eps", type=float, default=5.0, help="Report latency deltas larger than this (seconds)")
+    ap.add_argument("--show-changed", action="store_true", help="Show a preview of changed replies")
+    ap.add_argument("--json", action="store_true", help="Emit the diff as JSON")
+    ap.add_argument("--fail-on-flip", action="store_true", help="Exit 1 if any detector flag flipped")
+    args = ap.parse_args(argv)
+    if len(args.runs) < 2:
+        ap.error("need at least two runs to diff")
+
+    base_path = args.runs[0]
+    base = dict(iter_keyed(base_path, args.ignore_param))
+    total_flips = 0
+    for other in args.runs[1:]:
+        result = diff_runs(base_path, other, base, args.ignore_param)
+        if args.json:
+            print(json.dumps({
+                "base": result["base"],
+                "other": result["other"],
+                "pairs": [{"id": k[0], "seed": k[1], "base": a, "other": b, **d} for k, a, b, d in result["pairs"]],
+                "only_base": [{"id": k[0], "seed": k[1], **s} for k, s in result["only_base"]],
+                "only_other": [{"id": k[0], "seed": k[1], **s} for k, s in result["only_other"]],
+            }, ensure_ascii=False))
+            total_flips += sum(1 for p in result["pairs"] if p[3]["gained"] or p[3]["lost"])
+        else:
+            total_flips += print_report(result, args.score_eps, args.latency_eps, args.show_changed)
+    return 1 if args.fail_on_flip and total_flips else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 import argparse
 import json
 from pathlib import Path
+from typing import List, Optional
 
 
 DEFAULTS = {
@@ -56,10 +57,10 @@ def enrich(path: Path) -> None:
     print(f"Enriched {path.name}: topic={topic} sev={conf['severity']} breadth={conf['breadth']}")
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("files", nargs="+", help="Finding JSON files to enrich")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
     for f in args.files:
         enrich(Path(f))
 
@@ -1,15 +1,13 @@
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from src.rt_harness.records import read_record
 
 
 def load_jsonl_n(path: Path, index: int) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        for i, line in enumerate(f):
-            if i == index:
-                return json.loads(line)
-    raise IndexError(f"Index {index} out of range for {path}")
+    return read_record(str(path), index)
 
 
 def short(text: str, limit: int = 200) -> str:
@@ -17,11 +15,11 @@ def short(text: str, limit: int = 200) -> str:
     return t if len(t) <= limit else t[:limit] + "..."
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--run", required=True)
     parser.add_argument("--map", nargs="+", required=True, help="triples: idx findings_path title topic")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     run_path = Path(args.run)
     triples: List[str] = args.map
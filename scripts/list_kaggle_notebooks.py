@@ -1,43 +1,194 @@
-import sys
-from kaggle.api.kaggle_api_extended import KaggleApi
+import argparse
+import hashlib
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 
-def main() -> int:
-    api = KaggleApi()
-    api.authenticate()
+QUERIES = [
+    "openai-gpt-oss-20b",
+    "gpt-oss-20b red-teaming",
+    "open weight red-teaming 20b",
+    "gpt-oss red teaming",
+]
 
-    queries = [
-        "openai-gpt-oss-20b",
-        "gpt-oss-20b red-teaming",
-        "open weight red-teaming 20b",
-        "gpt-oss red teaming",
-    ]
 
-    seen_refs = set()
-    items = []
+class ResultCache:
+    """On-disk cache of kernels_list pages, one JSON file per (query, page, page_size).
+
+    ``page_size`` is part of the key because it decides both the page offsets
+    and whether a page counts as the short last one.
+    """
+
+    def __init__(self, root: Path, ttl_s: float):
+        self.root = root
+        self.ttl_s = ttl_s
+
+    def _path(self, query: str, page: int, page_size: int) -> Path:
+        key = hashlib.sha256(f"{query}\x00{page}\x00{page_size}".encode("utf-8")).hexdigest()[:24]
+        return self.root / f"{key}.json"
 
-    def fetch(q: str):
+    def get(self, query: str, page: int, page_size: int) -> Optional[List[Dict[str, Any]]]:
+        if self.ttl_s <= 0:
+            return None
+        path = self._path(query, page, page_size)
         try:
-            return api.kernels_list(search=q, page_size=50)
-        except TypeError:
-            return api.kernels_list(search=q)
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - data.get("fetched_at", 0) > self.ttl_s:
+            return None
+        return data.get("items")
+
+    def put(self, query: str, page: int, page_size: int, items: List[Dict[str, Any]]) -> None:
+        if self.ttl_s <= 0:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        payload = {"query": query, "page": page, "page_size": page_size, "fetched_at": time.time(), "items": items}
+        path = self._path(query, page, page_size)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+
+def _to_item(k: Any) -> Dict[str, Any]:
+    return {
+        "ref": getattr(k, "ref", "") or "",
+        "title": getattr(k, "title", "") or "",
+        "author": getattr(k, "author", "") or getattr(k, "authorName", "") or "",
+        "votes": int(getattr(k, "totalVotes", 0) or getattr(k, "voteCount", 0) or 0),
+    }
+
 
-    for q in queries:
-        for k in fetch(q):
-            ref = getattr(k, "ref", "")
+def fetch_page(api: Any, query: str, page: int, page_size: int) -> List[Dict[str, Any]]:
+    try:
+        kernels = api.kernels_list(search=query, page=page, page_size=page_size)
+    except TypeError:
+        # Older clients do not accept paging arguments; only page 1 is reachable.
+        if page > 1:
+            return []
+        kernels = api.kernels_list(search=query)
+    return [_to_item(k) for k in (kernels or [])]
+
+
+def fetch_query(api: Any, query: str, max_pages: int, page_size: int, cache: ResultCache) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    for page in range(1, max_pages + 1):
+        page_items = cache.get(query, page, page_size)
+        if page_items is None:
+            page_items = fetch_page(api, query, page, page_size)
+            cache.put(query, page, page_size, page_items)
+        items.extend(page_items)
+        if len(page_items) < page_size:
+            break
+    return items
+
+
+def search(
+    api: Any,
+    queries: List[str],
+    max_pages: int = 1,
+    page_size: int = 50,
+    cache: Optional[ResultCache] = None,
+    workers: int = 4,
+) -> List[Tuple[int, str, str, str]]:
+    """Run all queries concurrently and return (votes, title, author, url) sorted by votes."""
+    cache = cache or ResultCache(Path(".rt_cache/kaggle"), ttl_s=0)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(lambda q: fetch_query(api, q, max_pages, page_size, cache), queries))
+
+    seen_refs = set()
+    items = []
+    for page_items in results:
+        for k in page_items:
+            ref = k["ref"]
             if not ref or ref in seen_refs:
                 continue
             seen_refs.add(ref)
-            title = getattr(k, "title", "")
-            author = getattr(k, "author", "") or getattr(k, "authorName", "")
-            votes = getattr(k, "totalVotes", 0) or getattr(k, "voteCount", 0)
-            url = f"https://www.kaggle.com/{ref}"
-            items.append((int(votes or 0), title, author, url))
-
+            items.append((k["votes"], k["title"], k["author"], f"https://www.kaggle.com/{ref}"))
     items.sort(reverse=True, key=lambda x: x[0])
+    return items
+
+
+class StubApi:
+    """In-memory stand-in for ``KaggleApi`` serving ``total`` kernels per query."""
+
+    def __init__(self, total: int = 60):
+        self.total = total
+        self.calls = 0
+
+    def kernels_list(self, search: str, page: int = 1, page_size: int = 20) -> List[Any]:
+        self.calls += 1
+        start = (page - 1) * page_size
+        return [
+            argparse.Namespace(ref=f"user/{search}-{i}", title=f"{search} {i}", author="user", totalVotes=i)
+            for i in range(start, min(start + page_size, self.total))
+        ]
+
+
+def self_check() -> int:
+    """Run the paging and cache logic against ``StubApi``; returns the number of failed checks."""
+    failures = 0
+
+    def check(name: str, ok: bool) -> None:
+        nonlocal failures
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL'}: {name}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(Path(tmp), ttl_s=3600)
+        api = StubApi(total=60)
+        items = search(api, ["q"], max_pages=2, page_size=20, cache=cache)
+        check("page_size=20 x 2 pages fetches 40 items", len(items) == 40 and api.calls == 2)
+        api.calls = 0
+        items = search(api, ["q"], max_pages=2, page_size=20, cache=cache)
+        check("repeating the run is served from the cache", len(items) == 40 and api.calls == 0)
+        api.calls = 0
+        items = search(api, ["q"], max_pages=2, page_size=50, cache=cache)
+        check("a larger page_size does not reuse smaller cached pages", len(items) == 60 and api.calls == 2)
+        api.calls = 0
+        items = search(api, ["q"], max_pages=3, page_size=10, cache=cache)
+        refs = {url.rsplit("-", 1)[1] for _, _, _, url in items}
+        check("a smaller page_size keeps page offsets aligned", refs == {str(i) for i in range(30)} and api.calls == 3)
+    return failures
+
+
+def main(argv: Optional[List[str]] = None, api: Any = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--query", action="append", help="Search query (repeatable; defaults to the built-in list)")
+    ap.add_argument("--max-pages", type=int, default=1, help="Pages to fetch per query")
+    ap.add_argument("--page-size", type=int, default=50)
+    ap.add_argument("--workers", type=int, default=4, help="Concurrent queries")
+    ap.add_argument("--cache-dir", default=".rt_cache/kaggle")
+    ap.add_argument("--ttl", type=float, default=3600.0, help="Cache TTL in seconds (0 disables the cache)")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--self-check", action="store_true", help="Exercise paging and the cache against a stub API and exit")
+    args = ap.parse_args(argv)
+
+    if args.self_check:
+        return 1 if self_check() else 0
+
+    if api is None:
+        from kaggle.api.kaggle_api_extended import KaggleApi
+
+        api = KaggleApi()
+        api.authenticate()
+
+    items = search(
+        api,
+        args.query or QUERIES,
+        max_pages=args.max_pages,
+        page_size=args.page_size,
+        cache=ResultCache(Path(args.cache_dir), args.ttl),
+        workers=args.workers,
+    )
+
     print("votes | title | author | url")
     print("----- | ----- | ------ | ---")
-    for votes, title, author, url in items[:20]:
+    for votes, title, author, url in items[: args.top]:
         print(f"{votes:>5} | {title} | {author} | {url}")
 
     return 0
@@ -45,5 +196,3 @@ def main() -> int:
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
-
@@ -11,6 +11,14 @@ class ChatHandler(BaseHTTPRequestHandler):
         self.send_header("Content-Type", "application/json")
         self.end_headers()
 
+    def do_GET(self):  # noqa: N802 (BaseHTTPRequestHandler naming)
+        if urlparse(self.path).path == "/v1/models":
+            self._set_headers(200)
+            self.wfile.write(json.dumps({"object": "list", "data": [{"id": "gpt-oss-20b", "object": "model"}]}).encode("utf-8"))
+        else:
+            self._set_headers(404)
+            self.wfile.write(b"{}")
+
     def do_POST(self):  # noqa: N802 (BaseHTTPRequestHandler naming)
         parsed = urlparse(self.path)
         if parsed.path == "/v1/chat/completions":
@@ -35,6 +43,10 @@ class ChatHandler(BaseHTTPRequestHandler):
                 f"User said: {user_content[:200]}"
             )
 
+            if payload.get("stream"):
+                self._stream(payload, response_text)
+                return
+
             data = {
                 "id": "chatcmpl-mock-1",
                 "object": "chat.completion",
@@ -54,6 +66,32 @@ class ChatHandler(BaseHTTPRequestHandler):
             self._set_headers(404)
             self.wfile.write(b"{}")
 
+    def _stream(self, payload, response_text: str):
+        """Send the reply word by word as OpenAI-style server-sent events."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        words = response_text.split(" ")
+        try:
+            for i, word in enumerate(words):
+                chunk = {
+                    "id": "chatcmpl-mock-1",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": payload.get("model", "gpt-oss-20b"),
+                    "choices": [{
+                        "index": 0,
+                        "delta": {"content": word if i == 0 else " " + word},
+                        "finish_reason": "stop" if i == len(words) - 1 else None,
+                    }],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(0.005)
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client aborted the generation
+
 
 def run_server(host: str = "127.0.0.1", port: int = 8000):
     server = HTTPServer((host, port), ChatHandler)
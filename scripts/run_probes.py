@@ -3,103 +3,218 @@ import json
 import os
 import random
 from datetime import datetime
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from rich.progress import track
-import yaml
 
-from src.rt_harness.adapter_openai import OpenAICompatClient
-from src.rt_harness.adapter_ollama import OllamaClient
+from src.rt_harness.detectors import parse_rules
+from src.rt_harness.jsonl import JsonlWriter
+from src.rt_harness.profiling import PROFILER, add_profile_args, profile_run, span
+from src.rt_harness.prompts import DEFAULT_CACHE_DIR, count_prompts, iter_prompts, load_library
+from src.rt_harness.records import CompactWriter
+from src.rt_harness.router import build_client
+from src.rt_harness.runner import is_hit, ordered_map
+from src.rt_harness.runner import probe as run_probe
+from src.rt_harness.sampling import AdaptiveSampler, seed_for
+from src.rt_harness.warmup import ColdStartTagger, warm_up
 
 
-def load_prompts(path: str) -> List[Dict]:
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    assert isinstance(data, list), "YAML must be a list of prompt specs"
-    return data
+def probe(client: Any, spec: Dict, args: argparse.Namespace, seed: int) -> List[Dict[str, Any]]:
+    return run_probe(
+        client,
+        spec,
+        seed,
+        temperature=args.temperature,
+        max_tokens=args.max_tokens,
+        reasoning=args.reasoning,
+        abort_on=args.abort_on,
+    )
 
 
-def build_messages(spec: Dict) -> List[Dict]:
-    messages: List[Dict] = []
-    system_msg = spec.get("system")
-    if system_msg:
-        messages.append({"role": "system", "content": system_msg})
-    developer_msg = spec.get("developer")
-    if developer_msg:
-        messages.append({"role": "developer", "content": developer_msg})
-    user_msg = spec.get("user")
-    assert user_msg, "Prompt spec missing 'user'"
-    messages.append({"role": "user", "content": user_msg})
-    return messages
+def _reply(record: Dict[str, Any]) -> str:
+    return record["response"]["choices"][0]["message"].get("content", "")
 
 
-def main():
+def run_sweep(client: Any, prompts: Iterable[Dict], total: int, args: argparse.Namespace, fout: Any) -> None:
+    def jobs() -> Iterator[Tuple[int, Dict, int]]:
+        for idx, spec in enumerate(prompts):
+            seed = args.seed if args.seed is not None else random.randint(1, 1_000_000)
+            if args.log_stream:
+                print(f"[probe {idx+1}/{total}] id={spec.get('id','<no-id>')} seed={seed} ...", flush=True)
+            yield idx, spec, seed
+
+    def run(job: Tuple[int, Dict, int]) -> List[Dict[str, Any]]:
+        idx, spec, seed = job
+        try:
+            return probe(client, spec, args, seed)
+        except Exception as e:
+            if args.log_stream:
+                print(f"[probe {idx+1}] ERROR: {e}", flush=True)
+            raise
+
+    results: Iterable[Tuple[Any, List[Dict[str, Any]]]] = PROFILER.iter("wait_results", ordered_map(run, jobs(), args.concurrency))
+    if not args.log_stream:
+        from rich.progress import track
+
+        # Self time of the "progress" span is what rich adds on top of waiting for results.
+        results = PROFILER.iter("progress", track(results, total=total, description="Running probes"))
+    for (idx, _, _), records in results:
+        for record in records:
+            fout.write(record)
+            if args.log_stream:
+                preview = _reply(record).replace("\n", " ")[:120]
+                backend = f" backend={record['backend']}" if "backend" in record else ""
+                branch = f" branch={record['conversation']['branch']}" if (record.get("conversation") or {}).get("branch") else ""
+                aborted = f" aborted={record['aborted']['rule']}" if "aborted" in record else ""
+                print(f"[probe {idx+1}]{branch} latency={record['latency_s']:.2f}s{backend}{aborted} reply='{preview}...'", flush=True)
+
+
+def run_adaptive(client: Any, prompts: List[Dict], args: argparse.Namespace, fout: Any) -> AdaptiveSampler:
+    """Sample seeds per prompt until each reproduction rate is decided or the budget runs out."""
+    seeds = [int(s) for s in args.seeds.split(",")] if args.seeds else None
+    keys = [str(i) for i in range(len(prompts))]
+    budget = args.budget if args.budget is not None else len(prompts) * args.max_samples
+    sampler = AdaptiveSampler(
+        keys,
+        budget=budget,
+        min_samples=args.min_samples,
+        max_samples=args.max_samples,
+        threshold=args.threshold,
+        half_width=args.half_width,
+        confidence=args.confidence,
+    )
+    rnd = 0
+    while True:
+        batch = sampler.next_round()
+        if not batch:
+            break
+        rnd += 1
+        if args.log_stream:
+            print(f"[round {rnd}] sampling {len(batch)} undecided prompts (spent {sampler.spent}/{budget})", flush=True)
+        jobs = []
+        for key in batch:
+            seed = seed_for(sampler.stats[key].n, args.seed, seeds)
+            jobs.append((key, seed if seed is not None else random.randint(1, 1_000_000)))
+        for (key, seed), records in ordered_map(lambda job: probe(client, prompts[int(job[0])], args, job[1]), jobs, args.concurrency):
+            spec = prompts[int(key)]
+            sample = sampler.stats[key].n
+            # A multi-branch sample reproduces if any of its branches does.
+            with span("detect"):
+                hit = any(is_hit(r) for r in records)
+            sampler.record(key, seed, hit)
+            for record in records:
+                record["adaptive"] = {"sample": sample, "hit": hit}
+                fout.write(record)
+            if args.log_stream:
+                lo, hi = sampler.interval(key)
+                print(
+                    f"[probe] id={spec.get('id','<no-id>')} seed={seed} hit={hit} "
+                    f"rate={sampler.stats[key].rate:.2f} ci=[{lo:.2f},{hi:.2f}]",
+                    flush=True,
+                )
+    return sampler
+
+
+def print_adaptive_summary(sampler: AdaptiveSampler, prompts: List[Dict]) -> None:
+    print(f"Adaptive sampling used {sampler.spent}/{sampler.budget} completions")
+    print("id | n | hits | rate | ci | decided")
+    for row in sampler.summary():
+        rid = prompts[int(row["key"])].get("id", "<no-id>")
+        lo, hi = row["ci"]
+        print(f"{rid} | {row['n']} | {row['successes']} | {row['rate']:.2f} | [{lo:.2f}, {hi:.2f}] | {row['decided']}")
+
+
+def main(argv: Optional[List[str]] = None):
     load_dotenv()
     parser = argparse.ArgumentParser()
     parser.add_argument("--prompts", required=True, help="YAML file with prompt specs")
-    parser.add_argument("--out", required=True, help="Output JSONL path")
+    parser.add_argument("--out", required=True, help="Output JSONL path (.jsonl.gz / .jsonl.zst are compressed)")
     parser.add_argument("--temperature", type=float, default=0.7)
     parser.add_argument("--max-tokens", type=int, default=512)
     parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("--reasoning", type=str, default=None, choices=[None, "low", "medium", "high", "critical"])
     parser.add_argument("--log-stream", action="store_true", help="Print per-prompt progress to stdout")
-    args = parser.parse_args()
-
-    prompts = load_prompts(args.prompts)
-    adapter = os.getenv("MODEL_ADAPTER", "openai").lower()
-    if adapter == "ollama":
-        client = OllamaClient()
-    else:
-        client = OpenAICompatClient()
-
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    with open(args.out, "w", encoding="utf-8") as fout:
-        iterator = range(len(prompts))
-        if not args.log_stream:
-            iterator = track(iterator, description="Running probes")
-        for idx in iterator:
-            spec = prompts[idx]
-            messages = build_messages(spec)
-            seed = args.seed if args.seed is not None else random.randint(1, 1_000_000)
-            if args.log_stream:
-                print(f"[probe {idx+1}/{len(prompts)}] id={spec.get('id','<no-id>')} seed={seed} ...", flush=True)
-            try:
-                result = client.chat(
-                    messages=messages,
-                    temperature=args.temperature,
-                    max_tokens=args.max_tokens,
-                    seed=seed,
-                    reasoning=args.reasoning,
-                )
-                latency = result["latency_s"]
-                assistant_text = result["raw"]["choices"][0]["message"].get("content", "")
-            except Exception as e:
-                if args.log_stream:
-                    print(f"[probe {idx+1}] ERROR: {e}", flush=True)
-                raise
-
-            record = {
-                "ts": datetime.utcnow().isoformat() + "Z",
-                "spec": spec,
-                "messages": messages,
-                "response": result["raw"],
-                "latency_s": latency,
-                "params": {
-                    "temperature": args.temperature,
-                    "max_tokens": args.max_tokens,
-                    "seed": seed,
-                    "reasoning_level": args.reasoning,
-                },
-            }
-            fout.write(json.dumps(record, ensure_ascii=False) + "\n")
-            fout.flush()
-            if args.log_stream:
-                preview = assistant_text.replace("\n", " ")[:120]
-                print(f"[probe {idx+1}] latency={latency:.2f}s reply='{preview}...'", flush=True)
+    parser.add_argument("--prompt-cache", default=DEFAULT_CACHE_DIR, help="Directory for compiled prompt libraries ('' disables)")
+    parser.add_argument("--flush-bytes", type=int, default=64 * 1024, help="Write buffered records once this many bytes are pending")
+    parser.add_argument("--flush-interval", type=float, default=2.0, help="...or once this many seconds have passed")
+    parser.add_argument("--compact", action="store_true", help="Write compact records plus a <out>.prompts spec table")
+    parser.add_argument("--concurrency", type=int, default=1, help="Probes in flight at once")
+    parser.add_argument("--backends", default=None, help="Comma-separated base URLs to load-balance across (default: *_BASE_URLS env)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts per request for retryable errors (429/5xx/connection)")
+    parser.add_argument("--hedge", action="store_true", help="Send a duplicate request once the first exceeds the recent p95 latency")
+    parser.add_argument("--hedge-initial-delay", type=float, default=30.0, help="Hedge delay until enough latencies are observed")
+    parser.add_argument("--warmup", type=int, default=0, help="Throwaway requests per backend before the run (logged, not recorded)")
+    parser.add_argument("--warmup-log", default=None, help="Append warm-up latencies to this JSONL file")
+    parser.add_argument("--keep-alive", default=None, help="Ollama keep_alive for probes and preload (e.g. 30m)")
+    parser.add_argument("--cold-factor", type=float, default=3.0, help="Tag early records slower than this multiple of the steady median as cold_start")
+    parser.add_argument("--cold-window", type=int, default=3, help="Leading records per backend that may be tagged cold_start")
+    parser.add_argument("--route", default="least-outstanding", choices=["least-outstanding", "latency"], help="Backend routing strategy")
+    parser.add_argument(
+        "--abort-on",
+        default=None,
+        help="Stream replies and stop generating once one of these comma-separated detector rules fires ('all' for every rule)",
+    )
+    add_profile_args(parser)
+    adaptive = parser.add_argument_group("adaptive seed sweeps")
+    adaptive.add_argument("--adaptive", action="store_true", help="Sample seeds per prompt until the detector hit rate is decided")
+    adaptive.add_argument("--seeds", default=None, help="Comma-separated seed sequence (default: --seed + sample index, else random)")
+    adaptive.add_argument("--budget", type=int, default=None, help="Total completions (default: prompts x --max-samples)")
+    adaptive.add_argument("--min-samples", type=int, default=3)
+    adaptive.add_argument("--max-samples", type=int, default=10)
+    adaptive.add_argument("--threshold", type=float, default=0.5, help="Reproduction rate the interval is tested against")
+    adaptive.add_argument("--half-width", type=float, default=0.15, help="Stop once the interval half-width is at most this")
+    adaptive.add_argument("--confidence", type=float, default=0.95, choices=[0.8, 0.9, 0.95, 0.99])
+    args = parser.parse_args(argv)
+    if args.abort_on:
+        try:
+            args.abort_on = parse_rules(args.abort_on)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.keep_alive and os.getenv("MODEL_ADAPTER", "openai").lower() != "ollama":
+        parser.error("--keep-alive only applies to MODEL_ADAPTER=ollama")
 
+    with profile_run(args):
+        library = load_library(args.prompts, args.prompt_cache or None)
+        backends = [u.strip() for u in args.backends.split(",") if u.strip()] if args.backends else None
+        client_kwargs: Dict[str, Any] = {"timeout": args.timeout, "max_attempts": args.max_attempts}
+        if args.keep_alive:
+            client_kwargs["keep_alive"] = args.keep_alive
+        client = build_client(base_urls=backends, strategy=args.route, **client_kwargs)
+        if args.hedge:
+            from src.rt_harness.resilience import HedgedClient
 
-if __name__ == "__main__":
-    main()
+            client = HedgedClient(client, initial_delay=args.hedge_initial_delay, concurrency=args.concurrency)
+
+        try:
+            warmup = warm_up(client, args.warmup) if args.warmup > 0 else []
+            if args.warmup_log and warmup:
+                with open(args.warmup_log, "a", encoding="utf-8") as f:
+                    for entry in warmup:
+                        f.write(json.dumps({"ts": datetime.utcnow().isoformat() + "Z", "run": args.out, **entry}) + "\n")
 
+            os.makedirs(os.path.dirname(args.out), exist_ok=True)
+            writer_cls = CompactWriter if args.compact else JsonlWriter
+            with writer_cls(args.out, flush_bytes=args.flush_bytes, flush_interval=args.flush_interval) as raw_out, \
+                    ColdStartTagger(raw_out, factor=args.cold_factor, window=args.cold_window, warmup=warmup) as fout:
+                if args.adaptive:
+                    prompts = list(iter_prompts(library))
+                    sampler = run_adaptive(client, prompts, args, fout)
+                else:
+                    run_sweep(client, iter_prompts(library), count_prompts(library), args, fout)
+            if fout.tagged:
+                print(f"Tagged {fout.tagged} record(s) as cold_start")
+            if args.adaptive:
+                print_adaptive_summary(sampler, prompts)
+            if hasattr(client, "stats"):
+                for row in client.stats():
+                    print(f"backend={row['backend']} served={row['served']} healthy={row['healthy']}")
+            if args.hedge:
+                print(f"hedges sent={client.hedges_sent} won={client.hedges_won}")
+        finally:
+            if args.hedge:
+                client.close()
 
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.rt_harness.records import expand_record, iter_records, load_prompt_table
+from src.rt_harness.scoring import guess_topic
+
+
+DEFAULT_DB = os.path.join(".rt_cache", "search.sqlite")
+RUN_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+# Bump when the tables change; an index built by an older layout is rebuilt from scratch.
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files(
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime REAL,
+    offset INTEGER,
+    lines INTEGER,
+    prefix_sha TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+    response, prompt, spec_id, file UNINDEXED, idx UNINDEXED
+);
+"""
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS docs;")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def prefix_sha(path: str, length: int) -> str:
+    """sha256 of the first ``length`` bytes, to tell an append from a rewrite."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while length > 0:
+            block = f.read(min(length, 1 << 20))
+            if not block:
+                break
+            h.update(block)
+            length -= len(block)
+    return h.hexdigest()
+
+
+def run_files(paths: List[str]) -> List[str]:
+    """Run files under ``paths`` as real paths, so `outputs/x.jsonl`, `./outputs/x.jsonl`
+    and an absolute path share one index entry."""
+    out: List[str] = []
+    for p in paths:
+        path = Path(p)
+        if path.is_dir():
+            out.extend(sorted(os.path.realpath(f) for f in path.iterdir() if f.is_file() and f.name.endswith(RUN_SUFFIXES)))
+        elif path.is_file():
+            out.append(os.path.realpath(path))
+    return list(dict.fromkeys(out))
+
+
+def display_path(path: str) -> str:
+    """Path relative to the working directory when it lies below it."""
+    rel = os.path.relpath(path)
+    return path if rel.startswith("..") else rel
+
+
+def _doc(rec: Dict[str, Any], path: str, index: int) -> Tuple[str, str, str, str, int]:
+    response = (
+        (rec.get("response") or {})
+        .get("choices", [{}])[0]
+        .get("message", {})
+        .get("content", "")
+    ) or ""
+    prompt = "\n".join(m.get("content", "") or "" for m in rec.get("messages") or [])
+    spec_id = (rec.get("spec") or {}).get("id", "")
+    branch = (rec.get("conversation") or {}).get("branch")
+    if branch:
+        spec_id = f"{spec_id}/{branch}"
+    return response, prompt, spec_id, path, index
+
+
+def _tail_plain(path: str, offset: int, first_line: int) -> Iterator[Tuple[int, Dict[str, Any], int]]:
+    """Yield ``(line_index, record, end_offset)`` for complete lines after ``offset``."""
+    table: Optional[Dict[str, Dict[str, Any]]] = None
+    with open(path, "rb") as f:
+        f.seek(offset)
+        line_no = first_line
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # partial line still being written; pick it up next time
+            offset += len(raw)
+            i = line_no
+            line_no += 1
+            try:
+                row = json.loads(raw)
+            except ValueError:
+                yield i, {}, offset
+                continue
+            if "spec_hash" in row:
+                if table is None:
+                    table = load_prompt_table(path)
+                row = expand_record(row, table)
+            yield i, row, offset
+
+
+def index_file(conn: sqlite3.Connection, path: str) -> int:
+    """Index new records of ``path``; returns how many were added."""
+    st = os.stat(path)
+    row = conn.execute("SELECT size, mtime, offset, lines, prefix_sha FROM files WHERE path = ?", (path,)).fetchone()
+    if row and row[0] == st.st_size and row[1] == st.st_mtime:
+        return 0
+
+    plain = path.endswith(".jsonl")
+    # run_probes opens --out with "w", so a bigger file may be a rewrite rather than an append;
+    # only resume when the bytes already indexed are unchanged.
+    appended = bool(row) and plain and st.st_size > row[0] and prefix_sha(path, row[2]) == row[4]
+    offset, lines = (row[2], row[3]) if appended else (0, 0)
+    added = 0
+    with conn:
+        if not appended:
+            conn.execute("DELETE FROM docs WHERE file = ?", (path,))
+        if plain:
+            for i, rec, end in _tail_plain(path, offset, lines):
+                if rec:
+                    conn.execute("INSERT INTO docs VALUES (?, ?, ?, ?, ?)", _doc(rec, path, i))
+                    added += 1
+                offset, lines = end, i + 1
+        else:
+            for i, rec in iter_records(path):
+                conn.execute("INSERT INTO docs VALUES (?, ?, ?, ?, ?)", _doc(rec, path, i))
+                added += 1
+                lines = i + 1
+            offset = st.st_size
+        conn.execute(
+            "INSERT OR REPLACE INTO files(path, size, mtime, offset, lines, prefix_sha) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, st.st_size, st.st_mtime, offset, lines, prefix_sha(path, offset) if plain else None),
+        )
+    return added
+
+
+def prune(conn: sqlite3.Connection) -> int:
+    gone = [p for (p,) in conn.execute("SELECT path FROM files") if not os.path.exists(p)]
+    with conn:
+        for p in gone:
+            conn.execute("DELETE FROM docs WHERE file = ?", (p,))
+            conn.execute("DELETE FROM files WHERE path = ?", (p,))
+    return len(gone)
+
+
+def to_match(query: str, raw: bool = False) -> str:
+    """Quote each whitespace-separated term so `os.scandir` or `rm -rf` search literally."""
+    if raw:
+        return query
+    terms = [t for t in query.split() if t]
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def search(conn: sqlite3.Connection, query: str, field: str = "all", limit: int = 20, raw: bool = False) -> List[Dict[str, Any]]:
+    match = to_match(query, raw)
+    if field != "all":
+        match = f"{field} : ({match})"
+    rows = conn.execute(
+        "SELECT file, idx, spec_id, bm25(docs) AS rank, "
+        "snippet(docs, 0, '[', ']', '...', 12), snippet(docs, 1, '[', ']', '...', 12) "
+        "FROM docs WHERE docs MATCH ? ORDER BY rank LIMIT ?",
+        (match, limit),
+    ).fetchall()
+    return [
+        {"file": display_path(f), "index": int(i), "id": sid, "rank": r, "response_snippet": rs, "prompt_snippet": ps}
+        for f, i, sid, r, rs, ps in rows
+    ]
+
+
+def cmd_index(args: argparse.Namespace) -> int:
+    conn = connect(args.db)
+    start = time.perf_counter()
+    files = run_files(args.paths)
+    total = sum(index_file(conn, f) for f in files)
+    removed = prune(conn)
+    if args.optimize:
+        conn.execute("INSERT INTO docs(docs) VALUES ('optimize')")
+        conn.commit()
+    n_docs = conn.execute("SELECT count(*) FROM docs").fetchone()[0]
+    print(f"Indexed {total} new record(s) from {len(files)} file(s); pruned {removed}; {n_docs} total in {args.db} ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+def cmd_query(args: argparse.Namespace) -> int:
+    conn = connect(args.db)
+    start = time.perf_counter()
+    try:
+        hits = search(conn, " ".join(args.terms), field=args.field, limit=args.limit, raw=args.raw)
+    except sqlite3.OperationalError as e:
+        print(f"Bad query: {e}")
+        return 2
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if args.json:
+        print(json.dumps(hits, ensure_ascii=False))
+        return 0
+    for n, h in enumerate(hits, 1):
+        snippet = h["response_snippet"] if "[" in h["response_snippet"] else h["prompt_snippet"]
+        snippet = re.sub(r"\s+", " ", snippet)
+        print(f"#{n} rank={h['rank']:.2f} id={h['id']} src={h['file']} idx={h['index']} :: {snippet}")
+    print(f"# {len(hits)} hit(s) in {elapsed_ms:.1f} ms")
+    if args.emit_commands:
+        print("\n# Commands to generate findings:")
+        for n, h in enumerate(hits, 1):
+            title, topic = guess_topic(h["id"], f"Issue {n}")
+            print(f"python -m scripts.make_finding --title \"{title}\" --topic \"{topic}\" --run {h['file']} --index {h['index']} --out findings/findings.{n}.json")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Full-text search over run responses and prompts (SQLite FTS5)")
+    ap.add_argument("--db", default=DEFAULT_DB, help="Index database path")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    ip = sub.add_parser("index", help="Index new or changed run files")
+    ip.add_argument("paths", nargs="*", default=["outputs"], help="Run files or directories (default: outputs)")
+    ip.add_argument("--optimize", action="store_true", help="Merge FTS segments after indexing")
+    ip.set_defaults(func=cmd_index)
+
+    qp = sub.add_parser("query", help="Search the index")
+    qp.add_argument("terms", nargs="+", help="Search terms (each matched literally unless --raw)")
+    qp.add_argument("--field", choices=["all", "response", "prompt", "spec_id"], default="all")
+    qp.add_argument("--limit", type=int, default=20)
+    qp.add_argument("--raw", action="store_true", help="Pass the query through as FTS5 syntax (OR, NEAR, prefix*)")
+    qp.add_argument("--json", action="store_true")
+    qp.add_argument("--emit-commands", action="store_true", help="Emit make_finding commands for the hits")
+    qp.set_defaults(func=cmd_query)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
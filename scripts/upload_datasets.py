@@ -3,11 +3,13 @@ import json
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
 
-from kaggle.api.kaggle_api_extended import KaggleApi
+if TYPE_CHECKING:
+    from kaggle.api.kaggle_api_extended import KaggleApi
 
 
-def _get_username(api: KaggleApi) -> str:
+def _get_username(api: "KaggleApi") -> str:
     user = os.getenv("KAGGLE_USERNAME")
     if user:
         return user
@@ -42,7 +44,7 @@ def _slugify(value: str) -> str:
     return "".join(out) or "dataset"
 
 
-def create_or_version(api: KaggleApi, folder: Path, notes: str = "auto upload") -> None:
+def create_or_version(api: "KaggleApi", folder: Path, notes: str = "auto upload") -> None:
     meta_path = folder / "dataset-metadata.json"
     if not meta_path.exists():
         raise FileNotFoundError(f"Missing dataset-metadata.json in {folder}")
@@ -74,10 +76,12 @@ def create_or_version(api: KaggleApi, folder: Path, notes: str = "auto upload")
             raise
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--root", default="kaggle_datasets", help="Root directory with dataset subfolders")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    from kaggle.api.kaggle_api_extended import KaggleApi
 
     api = KaggleApi()
     api.authenticate()
@@ -1,13 +1,15 @@
 import argparse
 import json
-from jsonschema import validate, Draft202012Validator
+from typing import List, Optional
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser()
     parser.add_argument("finding_json", help="Path to finding JSON file")
     parser.add_argument("schema_json", help="Path to schema JSON file (findings.schema)")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    from jsonschema import validate, Draft202012Validator
 
     with open(args.finding_json, "r", encoding="utf-8") as f:
         finding = json.load(f)
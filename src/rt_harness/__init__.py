@@ -1,3 +1,13 @@
-__all__ = []
+from typing import Any
 
+# Resolved on first access so `import src.rt_harness` (and the `rt` CLI, which
+# imports this package) stays free of the api module's imports.
+__all__ = ["run_suite", "detect", "score", "build_findings", "load_run", "any_flag"]
 
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        from . import api
+
+        return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,11 @@
+import json
 import os
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+
+from .resilience import CircuitBreaker, call_with_retry
 
 
 class OllamaClient:
@@ -12,17 +14,40 @@ class OllamaClient:
     Env vars:
       - OLLAMA_BASE_URL (default http://127.0.0.1:11434)
       - MODEL_NAME (Ollama model tag)
+      - OLLAMA_KEEP_ALIVE (optional, e.g. "30m"; how long the model stays loaded)
+
+    Retries, circuit breaking and ``early_abort`` streaming behave as in
+    OpenAICompatClient. While streaming, only ``content`` deltas are checked.
     """
 
-    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        timeout: float = 120.0,
+        max_attempts: int = 3,
+        breaker: Optional[CircuitBreaker] = None,
+        keep_alive: Optional[str] = None,
+    ):
         self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434")
         self.model = model or os.getenv("MODEL_NAME", "")
         if not self.model:
             raise ValueError("MODEL_NAME must be set for OllamaClient")
         self.session = requests.Session()
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.breaker = breaker or CircuitBreaker()
+        self.keep_alive = keep_alive or os.getenv("OLLAMA_KEEP_ALIVE") or None
 
-    @retry(wait=wait_exponential(multiplier=1, min=1, max=10), stop=stop_after_attempt(3))
-    def chat(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 512, seed: Optional[int] = None, reasoning: Optional[str] = None) -> Dict:
+    def chat(
+        self,
+        messages: List[Dict],
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        seed: Optional[int] = None,
+        reasoning: Optional[str] = None,
+        early_abort: Optional[Callable[[], Callable[[str], Optional[str]]]] = None,
+    ) -> Dict:
         url = f"{self.base_url.rstrip('/')}/api/chat"
         # Map OpenAI-style messages to Ollama chat format
         payload: Dict = {
@@ -37,12 +62,30 @@ class OllamaClient:
         }
         if seed is not None:
             payload["options"]["seed"] = seed
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if early_abort is not None:
+            payload["stream"] = True
+            (data, latency_s, aborted), attempt = call_with_retry(
+                lambda: self._stream(url, payload, early_abort()), self.breaker, self.max_attempts
+            )
+            result = {"raw": self._normalize(data), "latency_s": latency_s, "attempt": {"retry": attempt}}
+            if aborted:
+                result["aborted"] = aborted
+            return result
 
-        start = time.time()
-        resp = self.session.post(url, json=payload, timeout=120)
-        latency_s = time.time() - start
-        resp.raise_for_status()
-        data = resp.json()
+        def send():
+            start = time.time()
+            resp = self.session.post(url, json=payload, timeout=self.timeout)
+            latency_s = time.time() - start
+            resp.raise_for_status()
+            return resp.json(), latency_s
+
+        (data, latency_s), attempt = call_with_retry(send, self.breaker, self.max_attempts)
+        return {"raw": self._normalize(data), "latency_s": latency_s, "attempt": {"retry": attempt}}
+
+    @staticmethod
+    def _normalize(data: Dict) -> Dict:
         # Normalize to OpenAI-like structure expected by the harness
         # Some reasoning models return content in `thinking` and leave `content` empty.
         # Prefer content; if empty, fall back to thinking.
@@ -51,7 +94,7 @@ class OllamaClient:
         except Exception:
             message_obj = {}
         content = message_obj.get("content") or message_obj.get("thinking") or ""
-        normalized = {
+        return {
             "choices": [
                 {
                     "index": 0,
@@ -60,6 +103,54 @@ class OllamaClient:
                 }
             ]
         }
-        return {"raw": normalized, "latency_s": latency_s}
 
+    def _stream(self, url: str, payload: Dict, check: Callable[[str], Optional[str]]):
+        """Read NDJSON chunks into one non-streaming-shaped response."""
+        start = time.time()
+        content: List[str] = []
+        thinking: List[str] = []
+        done_reason = "stop"
+        aborted = None
+        with self.session.post(url, json=payload, timeout=self.timeout, stream=True) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                message = chunk.get("message") or {}
+                if message.get("thinking"):
+                    thinking.append(message["thinking"])
+                delta = message.get("content") or ""
+                if delta:
+                    content.append(delta)
+                    rule = check(delta)
+                    if rule:
+                        aborted = {"rule": rule, "chars": sum(len(c) for c in content)}
+                        done_reason = "aborted"
+                        break
+                if chunk.get("done"):
+                    done_reason = chunk.get("done_reason", done_reason)
+                    break
+        data = {
+            "message": {"role": "assistant", "content": "".join(content), "thinking": "".join(thinking)},
+            "done_reason": done_reason,
+        }
+        return data, time.time() - start, aborted
+
+    def health(self, timeout: float = 5.0) -> bool:
+        """Return True if the Ollama server answers its tag listing endpoint."""
+        try:
+            resp = self.session.get(f"{self.base_url.rstrip('/')}/api/tags", timeout=timeout)
+        except requests.RequestException:
+            return False
+        return resp.status_code == 200
 
+    def preload(self) -> float:
+        """Load the model into memory without generating; returns the load latency."""
+        payload: Dict = {"model": self.model}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        start = time.time()
+        resp = self.session.post(f"{self.base_url.rstrip('/')}/api/generate", json=payload, timeout=self.timeout)
+        resp.raise_for_status()
+        return time.time() - start
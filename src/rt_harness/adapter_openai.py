@@ -1,9 +1,11 @@
+import json
 import os
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+
+from .resilience import CircuitBreaker, call_with_retry
 
 
 class OpenAICompatClient:
@@ -13,9 +15,27 @@ class OpenAICompatClient:
       - OPENAI_BASE_URL
       - OPENAI_API_KEY
       - MODEL_NAME
+
+    Throttling (429), 5xx and connection errors are retried up to
+    ``max_attempts`` times; other 4xx fail immediately. Repeated retryable
+    failures open the endpoint's circuit breaker.
+
+    With ``early_abort`` the request is streamed (SSE). ``early_abort`` is a
+    factory called once per attempt; the checker it returns is fed each content
+    delta and returns a rule name to stop generation. The connection is then
+    closed and the partial reply is returned with ``finish_reason`` "aborted"
+    and ``result["aborted"] = {"rule", "chars"}``.
     """
 
-    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        timeout: float = 120.0,
+        max_attempts: int = 3,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         self.base_url = base_url or os.getenv("OPENAI_BASE_URL", "http://127.0.0.1:8000/v1")
         self.api_key = api_key or os.getenv("OPENAI_API_KEY", "test-sk")
         self.model = model or os.getenv("MODEL_NAME", "gpt-oss-20b")
@@ -24,9 +44,19 @@ class OpenAICompatClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         })
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.breaker = breaker or CircuitBreaker()
 
-    @retry(wait=wait_exponential(multiplier=1, min=1, max=10), stop=stop_after_attempt(3))
-    def chat(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 512, seed: Optional[int] = None, reasoning: Optional[str] = None) -> Dict:
+    def chat(
+        self,
+        messages: List[Dict],
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        seed: Optional[int] = None,
+        reasoning: Optional[str] = None,
+        early_abort: Optional[Callable[[], Callable[[str], Optional[str]]]] = None,
+    ) -> Dict:
         url = f"{self.base_url.rstrip('/')}/chat/completions"
         payload: Dict = {
             "model": self.model,
@@ -38,12 +68,73 @@ class OpenAICompatClient:
             payload["seed"] = seed
         if reasoning is not None:
             payload["reasoning"] = {"effort": reasoning}
+        if early_abort is not None:
+            payload["stream"] = True
+            (data, latency_s, aborted), attempt = call_with_retry(
+                lambda: self._stream(url, payload, early_abort()), self.breaker, self.max_attempts
+            )
+            result = {"raw": data, "latency_s": latency_s, "attempt": {"retry": attempt}}
+            if aborted:
+                result["aborted"] = aborted
+            return result
 
-        start = time.time()
-        resp = self.session.post(url, json=payload, timeout=120)
-        latency_s = time.time() - start
-        resp.raise_for_status()
-        data = resp.json()
-        return {"raw": data, "latency_s": latency_s}
+        def send():
+            start = time.time()
+            resp = self.session.post(url, json=payload, timeout=self.timeout)
+            latency_s = time.time() - start
+            resp.raise_for_status()
+            return resp.json(), latency_s
+
+        (data, latency_s), attempt = call_with_retry(send, self.breaker, self.max_attempts)
+        return {"raw": data, "latency_s": latency_s, "attempt": {"retry": attempt}}
 
+    def _stream(self, url: str, payload: Dict, check: Callable[[str], Optional[str]]):
+        """Read SSE chunks into one non-streaming-shaped response."""
+        start = time.time()
+        parts: List[str] = []
+        head: Dict = {}
+        finish_reason = None
+        aborted = None
+        events = 0
+        with self.session.post(url, json=payload, timeout=self.timeout, stream=True) as resp:
+            resp.raise_for_status()
+            if "text/event-stream" not in resp.headers.get("Content-Type", ""):
+                # The server ignored "stream": true; the body is a complete chat.completion.
+                return resp.json(), time.time() - start, None
+            for line in resp.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                events += 1
+                body = line[5:].strip()
+                if body == b"[DONE]":
+                    break
+                chunk = json.loads(body)
+                head = head or {k: chunk[k] for k in ("id", "model", "created") if k in chunk}
+                choice = (chunk.get("choices") or [{}])[0]
+                finish_reason = choice.get("finish_reason") or finish_reason
+                delta = (choice.get("delta") or {}).get("content") or ""
+                if not delta:
+                    continue
+                parts.append(delta)
+                rule = check(delta)
+                if rule:
+                    # Leaving the block drops the connection, which stops decoding server-side.
+                    aborted = {"rule": rule, "chars": sum(len(p) for p in parts)}
+                    finish_reason = "aborted"
+                    break
+        if not events:
+            raise ValueError(f"{url} sent an event stream without any data events")
+        data = dict(head, choices=[{
+            "index": 0,
+            "message": {"role": "assistant", "content": "".join(parts)},
+            "finish_reason": finish_reason or "stop",
+        }])
+        return data, time.time() - start, aborted
 
+    def health(self, timeout: float = 5.0) -> bool:
+        """Return True if the server answers the model listing endpoint."""
+        try:
+            resp = self.session.get(f"{self.base_url.rstrip('/')}/models", timeout=timeout)
+        except requests.RequestException:
+            return False
+        return resp.status_code == 200
@@ -0,0 +1,140 @@
+"""Importable harness API for notebooks and services.
+
+Every function yields results lazily and takes already-built objects, so a
+long-lived client (with its connection pools, routing and breaker state), an
+executor and the process-wide prompt/detector caches are reused across calls:
+
+    from src.rt_harness import any_flag, build_findings, detect, run_suite, score
+    from src.rt_harness.router import build_client
+
+    client = build_client()
+    records = list(run_suite("data/prompts/novel.yaml", client, seed=[111, 222]))
+    hits = [f for f in detect(records) if any_flag(f)]
+    ranked = sorted(score("outputs/run-novel.t0.s111.jsonl"), key=lambda s: s[0], reverse=True)
+"""
+
+import os
+import random
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .detectors import any_flag, detect_record, parse_rules  # noqa: F401 (any_flag is re-exported)
+from .findings import build_finding
+from .prompts import DEFAULT_CACHE_DIR, iter_prompts, load_library
+from .records import iter_records
+from .runner import ordered_map, probe
+from .scoring import guess_topic, score_record
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+RecordSource = Union[str, "os.PathLike[str]", Iterable[Dict[str, Any]]]
+
+# (path, size, mtime_ns) -> parsed specs; saves re-hashing the file on every call.
+_LIBRARIES: Dict[Tuple[str, int, int], List[Dict]] = {}
+
+
+def load_specs(path: Union[str, "os.PathLike[str]"], cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> List[Dict]:
+    """Parsed specs of a prompt YAML, memoized in-process until the file changes."""
+    path = os.fspath(path)
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _LIBRARIES:
+        _LIBRARIES[key] = load_library(path, cache_dir)
+    return _LIBRARIES[key]
+
+
+def load_run(path: Union[str, "os.PathLike[str]"]) -> Iterator[Dict[str, Any]]:
+    """Records of a run file tagged with ``_file`` and ``_index`` (as ``detect_failures`` does)."""
+    path = os.fspath(path)
+    for i, rec in iter_records(path):
+        rec["_file"] = path
+        rec["_index"] = i
+        yield rec
+
+
+def _records(source: RecordSource) -> Iterator[Dict[str, Any]]:
+    if isinstance(source, (str, os.PathLike)):
+        return load_run(os.fspath(source))
+    return iter(source)
+
+
+def run_suite(
+    prompts: Union[str, "os.PathLike[str]", Iterable[Dict]],
+    client: Any = None,
+    seed: Union[None, int, Sequence[int]] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 512,
+    reasoning: Optional[str] = None,
+    abort_on: Union[None, str, List[str]] = None,
+    executor: Optional["Executor"] = None,
+    concurrency: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Probe every prompt and yield run records in prompt order.
+
+    ``prompts`` is a YAML path (``str`` or ``os.PathLike``) or an iterable of specs (variants are expanded).
+    ``seed`` is one seed for all prompts, a list (each prompt runs once per
+    seed), or None for a random seed per prompt. ``client`` defaults to
+    ``build_client()`` from the environment; pass one to reuse it across calls.
+    Probes run on ``executor`` when given, with at most ``2 * concurrency``
+    in flight (so ``concurrency`` is then required; pass the executor's worker
+    count), else on a pool of ``concurrency`` threads (default 1) created for
+    this call.
+    Multi-turn branches always get their own threads, so a small shared
+    executor cannot deadlock on them.
+    """
+    if client is None:
+        from .router import build_client
+
+        client = build_client()
+    specs = iter_prompts(load_specs(prompts) if isinstance(prompts, (str, os.PathLike)) else list(prompts))
+    rules = parse_rules(abort_on) if isinstance(abort_on, str) else abort_on
+    if concurrency is None:
+        if executor is not None:
+            raise ValueError("run_suite: pass concurrency along with executor")
+        concurrency = 1
+
+    def jobs() -> Iterator[Tuple[Dict, Optional[int]]]:
+        for spec in specs:
+            if seed is None:
+                yield spec, random.randint(1, 1_000_000)
+            elif isinstance(seed, int):
+                yield spec, seed
+            else:
+                for s in seed:
+                    yield spec, s
+
+    def run(job: Tuple[Dict, Optional[int]]) -> List[Dict[str, Any]]:
+        spec, s = job
+        return probe(client, spec, s, temperature=temperature, max_tokens=max_tokens, reasoning=reasoning, abort_on=rules)
+
+    for _, records in ordered_map(run, jobs(), concurrency, executor):
+        yield from records
+
+
+def detect(records: RecordSource) -> Iterator[Dict[str, Any]]:
+    """Yield detector flags (plus ``id``/``file``/``index``) per record; see ``any_flag``."""
+    for rec in _records(records):
+        yield detect_record(rec)
+
+
+def score(records: RecordSource) -> Iterator[Tuple[float, Dict[str, float], Dict[str, Any]]]:
+    """Yield ``(total, {"sev", "nov", "stab"}, record)`` per record, unsorted."""
+    for rec in _records(records):
+        total, parts = score_record(rec)
+        yield total, parts, rec
+
+
+def build_findings(
+    records: RecordSource,
+    title: Optional[str] = None,
+    topic: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield a findings document per record.
+
+    Title and topic default to the guess ``analyze_runs --emit-commands`` makes
+    from the prompt id.
+    """
+    for n, rec in enumerate(_records(records), 1):
+        guessed_title, guessed_topic = guess_topic((rec.get("spec") or {}).get("id", ""), f"Issue {n}")
+        yield build_finding(rec, title or guessed_title, topic or guessed_topic)
@@ -0,0 +1,56 @@
+"""Single ``rt`` entry point for the harness scripts.
+
+Only this module and the chosen subcommand's module are imported, so
+heavy dependencies (rich, requests, jsonschema, kaggle, ...) load only
+when the subcommand actually needs them.
+"""
+
+import importlib
+import sys
+from typing import List, Optional
+
+
+# name -> (module, one-line help)
+COMMANDS = {
+    "probe": ("scripts.run_probes", "Run prompt specs against a model endpoint"),
+    "detect": ("scripts.detect_failures", "Flag failure patterns in run files"),
+    "analyze": ("scripts.analyze_runs", "Score and rank records for triage"),
+    "diff": ("scripts.diff_runs", "Compare runs aligned by prompt id and seed"),
+    "search": ("scripts.search_runs", "Index and full-text search run responses"),
+    "finding": ("scripts.make_finding", "Build a findings JSON from a run record"),
+    "fill": ("scripts.fill_findings", "Refresh findings from run records"),
+    "enrich": ("scripts.enrich_findings", "Fill severity/breadth defaults by topic"),
+    "validate": ("scripts.validate_finding", "Validate a finding against the schema"),
+    "repro": ("scripts.assert_repro", "Assert stored behaviors reproduce"),
+    "upload": ("scripts.upload_datasets", "Create or version Kaggle datasets"),
+    "notebooks": ("scripts.list_kaggle_notebooks", "List related Kaggle notebooks"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: rt <command> [args...]", "", "commands:"]
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, help_text) in COMMANDS.items():
+        lines.append(f"  {name:<{width}}  {help_text}")
+    lines.append("")
+    lines.append("Run `rt <command> --help` for command options.")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(usage())
+        return 0
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"rt: unknown command '{name}'\n\n{usage()}", file=sys.stderr)
+        return 2
+    module = importlib.import_module(COMMANDS[name][0])
+    sys.argv = [f"rt {name}"] + rest
+    code = module.main(rest)
+    return code if isinstance(code, int) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
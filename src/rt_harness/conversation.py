@@ -0,0 +1,125 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .profiling import span
+from .prompts import _fill
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+def is_multi_turn(spec: Dict[str, Any]) -> bool:
+    return "turns" in spec or "branches" in spec
+
+
+def _user_text(turn: Any) -> str:
+    text = turn.get("user") if isinstance(turn, dict) else turn
+    assert isinstance(text, str) and text, "Each turn needs a non-empty user message"
+    return text
+
+
+def _branches(spec: Dict[str, Any]) -> List[Tuple[Optional[str], List[Any]]]:
+    branches = spec.get("branches")
+    if not branches:
+        return [(None, [])]
+    if isinstance(branches, dict):
+        return [(str(name), list(turns)) for name, turns in branches.items()]
+    return [(f"b{i}", list(turns) if isinstance(turns, list) else [turns]) for i, turns in enumerate(branches)]
+
+
+def _preamble(spec: Dict[str, Any]) -> List[Dict[str, str]]:
+    messages: List[Dict[str, str]] = []
+    if spec.get("system"):
+        messages.append({"role": "system", "content": spec["system"]})
+    if spec.get("developer"):
+        messages.append({"role": "developer", "content": spec["developer"]})
+    return messages
+
+
+class Conversation:
+    """Runs one multi-turn spec, optionally fanning out into branches.
+
+    Spec keys:
+      - ``turns``: user messages sent in order; each may reference earlier
+        assistant replies as ``{prev}`` (the latest) or ``{reply1}``, ``{reply2}``...
+      - ``branches``: a mapping ``name -> [user turns]`` (or a list of turn lists)
+        continued independently from the end of ``turns``.
+
+    The shared turns run first, one after another. The branches are then sent
+    concurrently, pinned to the backend that served the shared prefix when the
+    client is a RoutingClient, so their common prefix is already in that
+    server's KV/prefix cache. A turn aborted early by a detector ends its
+    branch, and that turn's partial reply becomes the response.
+    """
+
+    def __init__(self, client: Any, chat_kwargs: Dict[str, Any], executor: Optional["Executor"] = None):
+        self.client = client
+        self.chat_kwargs = chat_kwargs
+        self.executor = executor
+
+    def _send(self, messages: List[Dict[str, str]], backend: Optional[str]) -> Dict[str, Any]:
+        kwargs = dict(self.chat_kwargs)
+        if backend is not None and hasattr(self.client, "backends"):
+            kwargs["prefer_backend"] = backend
+        with span("chat"):
+            return self.client.chat(messages=messages, **kwargs)
+
+    def _advance(
+        self,
+        messages: List[Dict[str, str]],
+        replies: List[str],
+        turns: List[Any],
+        backend: Optional[str],
+    ) -> Tuple[List[Dict[str, str]], List[str], List[Dict[str, Any]]]:
+        messages, replies = list(messages), list(replies)
+        results: List[Dict[str, Any]] = []
+        for turn in turns:
+            values = {"prev": replies[-1] if replies else ""}
+            values.update({f"reply{i + 1}": r for i, r in enumerate(replies)})
+            messages.append({"role": "user", "content": _fill(_user_text(turn), values)})
+            result = self._send(messages, backend)
+            reply = result["raw"]["choices"][0]["message"].get("content", "") or ""
+            backend = result.get("backend", backend)
+            results.append(result)
+            messages.append({"role": "assistant", "content": reply})
+            replies.append(reply)
+            if result.get("aborted"):
+                # A detector already fired; later turns would only build on a cut-off reply.
+                break
+        return messages, replies, results
+
+    def run(self, spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return one transcript per branch (a single one if the spec has no branches).
+
+        Each transcript has ``messages`` (everything sent in the final request),
+        ``result`` (the final adapter result), ``branch`` and ``turn_latencies``.
+        """
+        shared = list(spec.get("turns") or [])
+        if not shared and "user" in spec:
+            shared = [spec["user"]]
+        messages, replies, prefix_results = self._advance(_preamble(spec), [], shared, None)
+        backend = prefix_results[-1].get("backend") if prefix_results else None
+
+        def finish(branch: Tuple[Optional[str], List[Any]]) -> Dict[str, Any]:
+            name, turns = branch
+            msgs, _, results = self._advance(messages, replies, turns, backend)
+            results = prefix_results + results
+            assert results, f"Spec {spec.get('id', '<no-id>')} has no turns"
+            return {
+                "branch": name,
+                # The final assistant reply is the response, not part of the request.
+                "messages": msgs[:-1],
+                "result": results[-1],
+                "turn_latencies": [r["latency_s"] for r in results],
+            }
+
+        branches = _branches(spec)
+        if prefix_results and prefix_results[-1].get("aborted"):
+            branches = [(None, [])]
+        if len(branches) == 1:
+            return [finish(branches[0])]
+        if self.executor is not None:
+            return list(self.executor.map(finish, branches))
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=len(branches)) as pool:
+            return list(pool.map(finish, branches))
@@ -0,0 +1,52 @@
+import os
+from typing import Any, Dict
+
+from .harmony import to_harmony
+
+
+def build_finding(record: Dict[str, Any], title: str, topic: str) -> Dict[str, Any]:
+    messages = record["messages"]
+    assistant_text = record["response"]["choices"][0]["message"]["content"]
+    prompt_id = (record.get("spec") or {}).get("id", "unknown")
+
+    convo = messages + [{"role": "assistant", "content": assistant_text}]
+    harmony_str = to_harmony(convo, reasoning_level=record["params"].get("reasoning_level") or "low")
+
+    out = {
+        "schema_version": "1.0.0",
+        "issue_title": title,
+        "model": {
+            "name": "gpt-oss-20b",
+            "version": os.getenv("MODEL_VERSION", "unknown"),
+            "provider": os.getenv("MODEL_PROVIDER", "open-weights"),
+            "parameters": {
+                "temperature": record["params"]["temperature"],
+                "reasoning_level": record["params"].get("reasoning_level") or "low",
+                "max_output_tokens": record["params"]["max_tokens"],
+                "seed": record["params"].get("seed"),
+            },
+        },
+        "environment": {
+            "endpoint": os.getenv("OPENAI_BASE_URL", "http://127.0.0.1:8000/v1"),
+            "hardware": os.getenv("HARDWARE", "unknown"),
+            "libraries": ["requests", "tenacity"],
+        },
+        "issue_summary": {
+            "title": title,
+            "topic_area": topic,
+            "overview": f"Prompt id: {prompt_id}. Describe the failure succinctly.",
+            "desired_behavior": "Model should respond safely and accurately, explicitly refusing or correcting as needed.",
+            "observed_behavior": assistant_text,
+            "self_assessed_severity": "1",
+            "self_assessed_severity_justification": "Initial estimate; update after analysis.",
+            "self_assessed_breadth": "1",
+            "self_assessed_breadth_justification": "Initial estimate; update after analysis.",
+        },
+        "harmony_response_walkthroughs": [harmony_str],
+        "steps_to_reproduce": [
+            "Run scripts/run_probes.py with the given parameters to reproduce the conversation.",
+            "Confirm the assistant message reproduces the issue.",
+        ],
+        "notes": "Update fields before submission.",
+    }
+    return out
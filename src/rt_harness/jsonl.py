@@ -0,0 +1,166 @@
+import gzip
+import io
+import json
+import os
+import time
+import warnings
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .profiling import span
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:  # pragma: no cover - optional dependency
+        raise ImportError("Reading or writing .zst files requires `pip install zstandard`") from e
+    return zstandard
+
+
+def open_text(path: str, mode: str = "r") -> IO[str]:
+    """Open a JSONL file for text I/O, compressing by suffix (``.gz`` or ``.zst``)."""
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        zstd = _zstd()
+        raw = zstd.open(path, mode + "b")
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _truncated(path: str) -> None:
+    warnings.warn(f"{path}: compressed stream ends early; read the complete lines before the cut")
+
+
+def _gzip_blocks(path: str) -> Iterator[bytes]:
+    with gzip.open(path, "rb") as f:
+        while True:
+            try:
+                # read1 hands back what is already decompressed instead of losing it to the error
+                block = f.read1(1 << 16)
+            except EOFError:
+                _truncated(path)
+                return
+            if not block:
+                return
+            yield block
+
+
+def _zstd_blocks(path: str) -> Iterator[bytes]:
+    # zstandard's stream reader stops short on an unfinished frame, so feed a
+    # decompressobj directly; it returns everything decodable so far.
+    zstd = _zstd()
+    d, fed = zstd.ZstdDecompressor().decompressobj(), False
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            while chunk:
+                fed = True
+                block = d.decompress(chunk)
+                if block:
+                    yield block
+                chunk = b""
+                if d.eof:  # next frame, if any
+                    chunk = d.unused_data
+                    d, fed = zstd.ZstdDecompressor().decompressobj(), False
+    if fed and not d.eof:
+        _truncated(path)
+
+
+def iter_lines(path: str) -> Iterator[str]:
+    """Yield the text lines of a (possibly compressed) JSONL file.
+
+    A compressed file whose stream is cut off (a writer that crashed or was
+    never closed) yields every complete line before the cut, then warns and
+    stops instead of raising; the partial last line is dropped.
+    """
+    path = str(path)
+    if not path.endswith((".gz", ".zst")):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from f
+        return
+    pending = b""
+    for block in (_zstd_blocks if path.endswith(".zst") else _gzip_blocks)(path):
+        lines = (pending + block).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode("utf-8") + "\n"
+    if pending:
+        yield pending.decode("utf-8")
+
+
+def iter_jsonl(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(line_index, record)``; unparsable lines are skipped but still counted."""
+    for i, line in enumerate(iter_lines(path)):
+        try:
+            with span("json_decode"):
+                rec = json.loads(line)
+        except ValueError:
+            continue
+        yield i, rec
+
+
+class JsonlWriter:
+    """Buffered JSONL writer that flushes on a size or time threshold.
+
+    Records are encoded immediately but written in batches of at least
+    ``flush_bytes`` characters or every ``flush_interval`` seconds, whichever
+    comes first. Compressed outputs are sync-flushed at each batch, so a crash
+    loses at most one batch (``iter_lines`` reads such a file up to the cut).
+    ``close()`` (also run on context exit, including after an exception)
+    writes whatever is still buffered. ``before_flush`` is called ahead of
+    every batch, e.g. to flush a file the batch refers to.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 2.0,
+        before_flush: Optional[Callable[[], None]] = None,
+    ):
+        self.path = str(path)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.before_flush = before_flush
+        self._f = open_text(self.path, "w")
+        self._buf: List[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        with span("json_encode"):
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._buf.append(line)
+        self._size += len(line)
+        if self._size >= self.flush_bytes or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.before_flush is not None:
+            self.before_flush()
+        with span("file_write"):
+            if self._buf:
+                self._f.write("".join(self._buf))
+                self._buf.clear()
+                self._size = 0
+            self._f.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        try:
+            self.flush()
+            try:
+                os.fsync(self._f.fileno())
+            except (OSError, io.UnsupportedOperation, AttributeError):
+                pass
+        finally:
+            self._f.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+_NULL = nullcontext()
+
+
+class Profiler:
+    """Collects named timing spans per thread.
+
+    Spans nest; the summary reports both total (inclusive) and self
+    (exclusive) time per name, so e.g. the cost of a progress bar wrapped
+    around the probe loop shows up separately from the probes themselves.
+    Completed spans are kept as Chrome trace events (``chrome://tracing`` /
+    Perfetto) up to ``max_events``. When disabled, ``span()`` returns a shared
+    null context and records nothing.
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = 1_000_000):
+        self.enabled = enabled
+        self.max_events = max_events
+        self.events: List[Dict[str, Any]] = []
+        self.totals: Dict[str, List[float]] = {}  # name -> [count, total_s, self_s]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+
+    def span(self, name: str):
+        if not self.enabled:
+            return _NULL
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [0.0]  # time spent in child spans
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += dur
+            with self._lock:
+                t = self.totals.setdefault(name, [0, 0.0, 0.0])
+                t[0] += 1
+                t[1] += dur
+                t[2] += dur - frame[0]
+                if len(self.events) < self.max_events:
+                    self.events.append({
+                        "name": name,
+                        "ph": "X",
+                        "ts": (start - self._t0) * 1e6,
+                        "dur": dur * 1e6,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                    })
+
+    def iter(self, name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+        """Wrap an iterable so that each ``next()`` is timed as a span."""
+        if not self.enabled:
+            yield from iterable
+            return
+        it = iter(iterable)
+        while True:
+            with self.span(name):
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+            yield item
+
+    def write_trace(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self) -> str:
+        rows = sorted(self.totals.items(), key=lambda kv: kv[1][2], reverse=True)
+        lines = ["stage | calls | total_s | self_s | mean_ms"]
+        for name, (count, total, self_s) in rows:
+            lines.append(f"{name} | {int(count)} | {total:.3f} | {self_s:.3f} | {1000 * total / max(count, 1):.3f}")
+        return "\n".join(lines)
+
+
+PROFILER = Profiler()
+
+
+def span(name: str):
+    return PROFILER.span(name)
+
+
+def add_profile_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", action="store_true", help="Record per-stage timing spans and print a summary to stderr")
+    group.add_argument("--profile-trace", default=None, help="Also write the spans as a Chrome trace JSON file")
+    group.add_argument("--cprofile", action="store_true", help="Run under cProfile (main thread only) and print hot functions")
+    group.add_argument("--cprofile-top", type=int, default=25)
+
+
+@contextmanager
+def profile_run(args: argparse.Namespace) -> Iterator[Optional[Profiler]]:
+    """Enable the global profiler (and cProfile) for the duration of a CLI run."""
+    enabled = bool(args.profile or args.profile_trace)
+    prof = None
+    if args.cprofile:
+        import cProfile
+
+        prof = cProfile.Profile()
+    PROFILER.enabled = enabled
+    try:
+        if prof is not None:
+            prof.enable()
+        with PROFILER.span("total"):
+            yield PROFILER if enabled else None
+    finally:
+        if prof is not None:
+            prof.disable()
+        PROFILER.enabled = False
+        if enabled:
+            print(PROFILER.summary(), file=sys.stderr)
+            if args.profile_trace:
+                PROFILER.write_trace(args.profile_trace)
+                print(f"Wrote trace {args.profile_trace}", file=sys.stderr)
+        if prof is not None:
+            import pstats
+
+            stats = pstats.Stats(prof, stream=sys.stderr)
+            stats.sort_stats("cumulative").print_stats(args.cprofile_top)
@@ -0,0 +1,137 @@
+import hashlib
+import itertools
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+from .profiling import span
+
+
+DEFAULT_CACHE_DIR = os.path.join(".rt_cache", "prompts")
+TEMPLATE_FIELDS = ("system", "developer", "user")
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def _parse_yaml(raw: bytes) -> List[Dict]:
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with span("yaml_load"):
+        data = yaml.load(raw, Loader=loader)
+    assert isinstance(data, list), "YAML must be a list of prompt specs"
+    return data
+
+
+def load_library(path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> List[Dict]:
+    """Load raw (unexpanded) prompt specs, using a compiled cache keyed by source hash.
+
+    The compiled form is a pickle of the parsed spec list, so a warm start skips
+    YAML parsing entirely. Pass ``cache_dir=None`` to always parse the source.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if not cache_dir:
+        return _parse_yaml(raw)
+
+    import pickle
+
+    digest = hashlib.sha256(raw).hexdigest()
+    compiled = os.path.join(cache_dir, f"{digest}.pickle")
+    try:
+        with open(compiled, "rb") as f, span("prompt_cache_load"):
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    specs = _parse_yaml(raw)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{compiled}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(specs, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, compiled)
+    return specs
+
+
+def _fill(template: str, values: Dict[str, str]) -> str:
+    # Only known variant names are substituted, so literal braces (JSON, code) survive.
+    return _PLACEHOLDER.sub(lambda m: str(values[m.group(1)]) if m.group(1) in values else m.group(0), template)
+
+
+def _fill_turn(turn: Any, values: Dict[str, str]) -> Any:
+    if isinstance(turn, str):
+        return _fill(turn, values)
+    if isinstance(turn, dict) and isinstance(turn.get("user"), str):
+        return dict(turn, user=_fill(turn["user"], values))
+    return turn
+
+
+def _fill_turns(turns: Any, values: Dict[str, str]) -> Any:
+    """``turns`` (or one branch's turns) with variant values filled in; ``{prev}``/``{replyN}`` are kept."""
+    if isinstance(turns, list):
+        return [_fill_turn(t, values) for t in turns]
+    return _fill_turn(turns, values)
+
+
+def variant_count(spec: Dict) -> int:
+    variants = spec.get("variants") or {}
+    n = 1
+    for options in variants.values():
+        n *= len(options)
+    return n
+
+
+def expand_spec(spec: Dict) -> Iterator[Dict]:
+    """Yield concrete specs for a template spec.
+
+    A spec with a ``variants`` mapping of ``name -> [options]`` expands to the
+    cartesian product of the options, substituting ``{name}`` in the system,
+    developer and user fields and in multi-turn ``turns`` and ``branches``
+    (where ``{prev}``/``{replyN}`` are left for the conversation). Variants are generated one at a time and are
+    never materialized as a whole. Specs without ``variants`` pass through.
+    """
+    variants = spec.get("variants")
+    if not variants:
+        yield spec
+        return
+    names = list(variants)
+    base = {k: v for k, v in spec.items() if k != "variants"}
+    base_id = spec.get("id", "variant")
+    for n, combo in enumerate(itertools.product(*(variants[k] for k in names))):
+        values = dict(zip(names, combo))
+        out = dict(base)
+        for key in TEMPLATE_FIELDS:
+            if isinstance(out.get(key), str):
+                out[key] = _fill(out[key], values)
+        if "turns" in out:
+            out["turns"] = _fill_turns(out["turns"], values)
+        branches = out.get("branches")
+        if isinstance(branches, dict):
+            out["branches"] = {name: _fill_turns(turns, values) for name, turns in branches.items()}
+        elif isinstance(branches, list):
+            out["branches"] = [_fill_turns(turns, values) for turns in branches]
+        out["id"] = f"{base_id}#{n}"
+        out["variant"] = values
+        yield out
+
+
+def iter_prompts(specs: List[Dict]) -> Iterator[Dict]:
+    for spec in specs:
+        yield from expand_spec(spec)
+
+
+def count_prompts(specs: List[Dict]) -> int:
+    return sum(variant_count(s) for s in specs)
+
+
+def build_messages(spec: Dict) -> List[Dict]:
+    messages: List[Dict] = []
+    system_msg = spec.get("system")
+    if system_msg:
+        messages.append({"role": "system", "content": system_msg})
+    developer_msg = spec.get("developer")
+    if developer_msg:
+        messages.append({"role": "developer", "content": developer_msg})
+    user_msg = spec.get("user")
+    assert user_msg, "Prompt spec missing 'user'"
+    messages.append({"role": "user", "content": user_msg})
+    return messages
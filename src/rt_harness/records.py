@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .conversation import is_multi_turn
+from .jsonl import JsonlWriter, iter_jsonl, iter_lines
+from .prompts import build_messages
+
+
+# Keys of a legacy record that a compact record stores differently.
+_LEGACY_ONLY = {"spec", "messages", "response"}
+
+
+def spec_hash(spec: Dict[str, Any]) -> str:
+    raw = json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def prompt_table_path(run_path: str) -> str:
+    """Sidecar prompt table for a compact run: ``<run file>.prompts`` (plain JSONL)."""
+    return f"{run_path}.prompts"
+
+
+def compact_record(record: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Split a legacy record into its spec hash and the compact row.
+
+    The compact row keeps params, reply content, finish_reason, usage and
+    timings (plus any extra annotations); spec, messages and the raw
+    response envelope are dropped. Multi-turn transcripts keep their
+    messages, since earlier replies cannot be rebuilt from the spec.
+    """
+    spec = record.get("spec") or {}
+    h = spec_hash(spec)
+    response = record.get("response") or {}
+    choice = (response.get("choices") or [{}])[0]
+    row: Dict[str, Any] = {"spec_hash": h}
+    for key, value in record.items():
+        if key not in _LEGACY_ONLY:
+            row[key] = value
+    row["content"] = (choice.get("message") or {}).get("content", "")
+    row["finish_reason"] = choice.get("finish_reason")
+    if response.get("usage") is not None:
+        row["usage"] = response["usage"]
+    if is_multi_turn(spec):
+        row["messages"] = record.get("messages")
+    return h, row
+
+
+def expand_record(row: Dict[str, Any], table: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuild the legacy record shape from a compact row and its prompt table."""
+    if "spec_hash" not in row:
+        return row
+    spec = table.get(row["spec_hash"])
+    if spec is None:
+        raise KeyError(f"spec_hash {row['spec_hash']} missing from prompt table")
+    response: Dict[str, Any] = {
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": row.get("content", "")},
+                "finish_reason": row.get("finish_reason"),
+            }
+        ]
+    }
+    if row.get("usage") is not None:
+        response["usage"] = row["usage"]
+    messages = row["messages"] if "messages" in row else build_messages(spec)
+    record: Dict[str, Any] = {"ts": row.get("ts"), "spec": spec, "messages": messages, "response": response}
+    for key, value in row.items():
+        if key not in {"spec_hash", "content", "finish_reason", "usage", "ts", "messages"}:
+            record[key] = value
+    return record
+
+
+def load_prompt_table(run_path: str) -> Dict[str, Dict[str, Any]]:
+    path = prompt_table_path(run_path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Compact run {run_path} has no prompt table at {path}")
+    return {row["spec_hash"]: row["spec"] for _, row in iter_jsonl(path)}
+
+
+def iter_records(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(line_index, legacy_record)`` from legacy or compact run files."""
+    table: Optional[Dict[str, Dict[str, Any]]] = None
+    for i, row in iter_jsonl(path):
+        if "spec_hash" in row:
+            if table is None:
+                table = load_prompt_table(path)
+            row = expand_record(row, table)
+        yield i, row
+
+
+def read_record(path: str, index: int) -> Dict[str, Any]:
+    for i, line in enumerate(iter_lines(path)):
+        if i == index:
+            row = json.loads(line)
+            if "spec_hash" in row:
+                row = expand_record(row, load_prompt_table(path))
+            return row
+    raise IndexError(f"Index {index} out of range for {path}")
+
+
+class CompactWriter:
+    """JsonlWriter drop-in that writes compact rows plus a per-run prompt table."""
+
+    def __init__(self, path: str, **writer_kwargs: Any):
+        self.path = str(path)
+        self._table = JsonlWriter(prompt_table_path(self.path), **writer_kwargs)
+        # The table is flushed ahead of every row batch, so rows never reference unwritten specs.
+        self._rows = JsonlWriter(self.path, before_flush=self._table.flush, **writer_kwargs)
+        self._seen: set = set()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        h, row = compact_record(record)
+        if h not in self._seen:
+            self._seen.add(h)
+            self._table.write({"spec_hash": h, "spec": record.get("spec") or {}})
+        self._rows.write(row)
+
+    def flush(self) -> None:
+        self._rows.flush()
+
+    def close(self) -> None:
+        try:
+            self._rows.close()
+        finally:
+            self._table.close()
+
+    def __enter__(self) -> "CompactWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import requests
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without touching the network while an endpoint's breaker is open."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Retry on throttling, server errors and transport failures; fail fast on other 4xx."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, requests.HTTPError):
+        status = exc.response.status_code if exc.response is not None else None
+        return status is None or status == 429 or status >= 500
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+class CircuitBreaker:
+    """Per-endpoint breaker: opens after ``failure_threshold`` consecutive retryable
+    failures, then lets a single trial request through after ``reset_timeout`` seconds."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> None:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return
+        raise CircuitOpenError(f"circuit open after {self.failures} consecutive failures")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+
+
+def call_with_retry(fn: Callable[[], T], breaker: Optional[CircuitBreaker] = None, max_attempts: int = 3) -> Tuple[T, int]:
+    """Call ``fn`` with classified retries; return its result and the 1-based attempt that produced it."""
+    retrying = Retrying(
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        stop=stop_after_attempt(max_attempts),
+        retry=retry_if_exception(is_retryable),
+        reraise=True,
+    )
+    for attempt in retrying:
+        with attempt:
+            if breaker is not None:
+                breaker.allow()
+            try:
+                result = fn()
+            except Exception as e:
+                if breaker is not None:
+                    # A non-retryable error still means the endpoint answered.
+                    if is_retryable(e):
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return result, attempt.retry_state.attempt_number
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+class LatencyWindow:
+    """Rolling window of recent latencies for quantile estimates."""
+
+    def __init__(self, size: int = 200):
+        self._values: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, value: float) -> None:
+        with self._lock:
+            self._values.append(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            values = sorted(self._values)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class HedgedClient:
+    """Send a duplicate request when the first is slower than the recent p95.
+
+    The hedge goes out after ``quantile`` of the last observed latencies
+    (``initial_delay`` until ``min_samples`` have been seen) and whichever
+    request answers first wins. ``result["attempt"]["hedge"]`` is True when
+    the duplicate won. Other attributes are delegated to the wrapped client.
+
+    Primaries and hedges use separate pools, so a hedge never queues behind the
+    requests it bypasses. Pass the caller's ``concurrency``; each pool gets
+    twice that, leaving room for losers still in flight. Call ``close()`` when done.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        initial_delay: float = 30.0,
+        min_delay: float = 0.5,
+        concurrency: int = 1,
+    ):
+        self.client = client
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.window = LatencyWindow()
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+        workers = 2 * max(1, concurrency)
+        self._primary_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="primary")
+        self._hedge_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedge")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def hedge_delay(self) -> float:
+        if len(self.window) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, self.window.quantile(self.quantile) or self.initial_delay)
+
+    def chat(self, messages: List[Dict], **kwargs: Any) -> Dict:
+        start = time.time()
+        primary = self._primary_pool.submit(self.client.chat, messages=messages, **kwargs)
+        done, _ = wait([primary], timeout=self.hedge_delay())
+        futures = {primary: False}
+        if not done:
+            hedge_kwargs = {k: v for k, v in kwargs.items() if k != "prefer_backend"}
+            futures[self._hedge_pool.submit(self.client.chat, messages=messages, **hedge_kwargs)] = True
+            with self._lock:
+                self.hedges_sent += 1
+
+        pending = set(futures)
+        last_exc: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                exc = fut.exception()
+                if exc is not None:
+                    last_exc = exc
+                    continue
+                result = fut.result()
+                is_hedge = futures[fut]
+                if is_hedge:
+                    with self._lock:
+                        self.hedges_won += 1
+                self.window.add(result.get("latency_s", time.time() - start))
+                result.setdefault("attempt", {})["hedge"] = is_hedge
+                return result
+        assert last_exc is not None
+        raise last_exc
+
+    def close(self) -> None:
+        """Stop the worker pools; losing requests still in flight are not waited for."""
+        self._primary_pool.shutdown(wait=False)
+        self._hedge_pool.shutdown(wait=False)
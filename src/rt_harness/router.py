@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .resilience import CircuitOpenError, is_retryable
+
+
+class NoHealthyBackendError(RuntimeError):
+    pass
+
+
+class Backend:
+    def __init__(self, client: Any, name: Optional[str] = None):
+        self.client = client
+        self.name = name or getattr(client, "base_url", repr(client))
+        self.outstanding = 0
+        self.ewma_latency: Optional[float] = None
+        self.healthy = True
+        self.failures = 0
+        self.last_check = 0.0
+        self.served = 0
+
+
+class RoutingClient:
+    """Spread chat calls over several adapter clients serving the same model.
+
+    Strategies:
+      - ``least-outstanding``: fewest in-flight requests, ties broken by latency
+      - ``latency``: lowest expected wait, ``(outstanding + 1) * ewma_latency``
+
+    A backend is marked down after ``max_failures`` consecutive errors and is
+    re-admitted once its ``health()`` check passes; down backends are re-checked
+    at most every ``health_interval`` seconds. Only retryable errors (429, 5xx,
+    connection failures) fail over and count against a backend; an open
+    circuit breaker fails over without counting, and other errors (e.g. a
+    400 for a bad request) are raised at once. Each result carries the name of
+    the backend that served it under ``"backend"``; passing that name back as
+    ``prefer_backend`` keeps follow-up turns on the same server.
+    """
+
+    def __init__(
+        self,
+        clients: List[Any],
+        strategy: str = "least-outstanding",
+        health_interval: float = 30.0,
+        max_failures: int = 2,
+        alpha: float = 0.3,
+    ):
+        if not clients:
+            raise ValueError("RoutingClient needs at least one client")
+        if strategy not in ("least-outstanding", "latency"):
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        self.backends = [Backend(c) for c in clients]
+        self.strategy = strategy
+        self.health_interval = health_interval
+        self.max_failures = max_failures
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> str:
+        return getattr(self.backends[0].client, "model", "")
+
+    def _score(self, b: Backend) -> tuple:
+        lat = b.ewma_latency if b.ewma_latency is not None else 0.0
+        if self.strategy == "latency":
+            return ((b.outstanding + 1) * lat, b.outstanding)
+        return (b.outstanding, lat)
+
+    def _recheck(self, force: bool = False) -> None:
+        now = time.time()
+        for b in self.backends:
+            if b.healthy or (not force and now - b.last_check < self.health_interval):
+                continue
+            b.last_check = now
+            ok = False
+            try:
+                ok = bool(b.client.health())
+            except Exception:
+                ok = False
+            if ok:
+                with self._lock:
+                    b.healthy = True
+                    b.failures = 0
+
+    def _acquire(self, exclude: List[Backend], prefer: Optional[str] = None) -> Backend:
+        self._recheck()
+        with self._lock:
+            candidates = [b for b in self.backends if b.healthy and b not in exclude]
+            preferred = [b for b in candidates if b.name == prefer]
+            if candidates:
+                chosen = preferred[0] if preferred else min(candidates, key=self._score)
+                chosen.outstanding += 1
+                return chosen
+        self._recheck(force=True)
+        with self._lock:
+            candidates = [b for b in self.backends if b.healthy and b not in exclude]
+            if not candidates:
+                raise NoHealthyBackendError("No healthy backends available")
+            chosen = min(candidates, key=self._score)
+            chosen.outstanding += 1
+            return chosen
+
+    def _release(self, b: Backend, latency_s: Optional[float], failed: bool = True) -> None:
+        with self._lock:
+            b.outstanding -= 1
+            if latency_s is None:
+                if not failed:
+                    return
+                b.failures += 1
+                if b.failures >= self.max_failures:
+                    b.healthy = False
+                    b.last_check = time.time()
+                return
+            b.failures = 0
+            b.served += 1
+            if b.ewma_latency is None:
+                b.ewma_latency = latency_s
+            else:
+                b.ewma_latency = self.alpha * latency_s + (1 - self.alpha) * b.ewma_latency
+
+    def chat(self, messages: List[Dict], prefer_backend: Optional[str] = None, **kwargs: Any) -> Dict:
+        """Send to the best healthy backend, or to ``prefer_backend`` while it is healthy."""
+        tried: List[Backend] = []
+        last_exc: Optional[Exception] = None
+        while len(tried) < len(self.backends):
+            try:
+                b = self._acquire(tried, prefer_backend)
+            except NoHealthyBackendError:
+                if last_exc is not None:
+                    raise last_exc
+                raise
+            tried.append(b)
+            try:
+                result = b.client.chat(messages=messages, **kwargs)
+            except CircuitOpenError as e:
+                # Refused locally without a request; try another backend but don't count it.
+                self._release(b, None, failed=False)
+                last_exc = e
+                continue
+            except Exception as e:
+                if not is_retryable(e):
+                    # The request itself is bad; every backend would reject it the same way.
+                    self._release(b, None, failed=False)
+                    raise
+                self._release(b, None)
+                last_exc = e
+                continue
+            self._release(b, result.get("latency_s"))
+            result["backend"] = b.name
+            return result
+        assert last_exc is not None
+        raise last_exc
+
+    def health(self) -> bool:
+        self._recheck(force=True)
+        return any(b.healthy for b in self.backends)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "backend": b.name,
+                    "healthy": b.healthy,
+                    "served": b.served,
+                    "outstanding": b.outstanding,
+                    "ewma_latency_s": b.ewma_latency,
+                }
+                for b in self.backends
+            ]
+
+
+def build_client(
+    adapter: Optional[str] = None,
+    base_urls: Optional[List[str]] = None,
+    strategy: str = "least-outstanding",
+    **client_kwargs: Any,
+) -> Any:
+    """Create an adapter client from env, wrapping it in a RoutingClient for multiple URLs.
+
+    Multiple endpoints come from ``base_urls`` or the comma-separated
+    ``OPENAI_BASE_URLS`` / ``OLLAMA_BASE_URLS`` env vars. ``client_kwargs``
+    (e.g. ``timeout``, ``max_attempts``) go to every adapter client.
+    """
+    adapter = (adapter or os.getenv("MODEL_ADAPTER", "openai")).lower()
+    if adapter == "ollama":
+        from .adapter_ollama import OllamaClient as client_cls
+
+        env_urls = os.getenv("OLLAMA_BASE_URLS", "")
+    else:
+        from .adapter_openai import OpenAICompatClient as client_cls
+
+        env_urls = os.getenv("OPENAI_BASE_URLS", "")
+    urls = base_urls or [u.strip() for u in env_urls.split(",") if u.strip()]
+    if len(urls) <= 1:
+        return client_cls(base_url=urls[0] if urls else None, **client_kwargs)
+    return RoutingClient([client_cls(base_url=u, **client_kwargs) for u in urls], strategy=strategy)
@@ -0,0 +1,102 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .conversation import Conversation, is_multi_turn
+from .detectors import StreamDetector, any_flag, detect_record
+from .profiling import span
+from .prompts import build_messages
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+def make_record(spec: Dict, messages: List[Dict], result: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build one run record; ``params`` holds temperature, max_tokens, seed and reasoning_level."""
+    record = {
+        "ts": datetime.utcnow().isoformat() + "Z",
+        "spec": spec,
+        "messages": messages,
+        "response": result["raw"],
+        "latency_s": result["latency_s"],
+        "params": params,
+    }
+    for key in ("backend", "attempt", "aborted"):
+        if key in result:
+            record[key] = result[key]
+    return record
+
+
+def probe(
+    client: Any,
+    spec: Dict,
+    seed: Optional[int],
+    temperature: float = 0.7,
+    max_tokens: int = 512,
+    reasoning: Optional[str] = None,
+    abort_on: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Send one prompt spec and return its run records (one per branch for multi-turn specs)."""
+    chat_kwargs: Dict[str, Any] = {
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "seed": seed,
+        "reasoning": reasoning,
+    }
+    if abort_on:
+        chat_kwargs["early_abort"] = partial(StreamDetector, spec.get("id", ""), abort_on)
+    params = {"temperature": temperature, "max_tokens": max_tokens, "seed": seed, "reasoning_level": reasoning}
+    if not is_multi_turn(spec):
+        with span("build_messages"):
+            messages = build_messages(spec)
+        with span("chat"):
+            result = client.chat(messages=messages, **chat_kwargs)
+        return [make_record(spec, messages, result, params)]
+    records = []
+    for transcript in Conversation(client, chat_kwargs).run(spec):
+        record = make_record(spec, transcript["messages"], transcript["result"], dict(params))
+        record["conversation"] = {
+            "branch": transcript["branch"],
+            "turns": len(transcript["turn_latencies"]),
+            "turn_latencies": transcript["turn_latencies"],
+        }
+        records.append(record)
+    return records
+
+
+def is_hit(record: Dict[str, Any]) -> bool:
+    """A sample reproduces the issue when any detector flag fires."""
+    return any_flag(detect_record(record))
+
+
+def ordered_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int,
+    executor: Optional["Executor"] = None,
+) -> Iterator[Tuple[Any, Any]]:
+    """Yield ``(item, fn(item))`` in input order with at most ``2 * workers`` calls in flight.
+
+    Items are pulled lazily, so generator inputs are never materialized. A
+    caller-owned ``executor`` is used as is (and left running); otherwise a
+    pool of ``workers`` threads is created for the call.
+    """
+    if executor is None and workers <= 1:
+        for item in items:
+            yield item, fn(item)
+        return
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from ordered_map(fn, items, workers, pool)
+        return
+    pending: deque = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= 2 * max(workers, 1):
+            head, fut = pending.popleft()
+            yield head, fut.result()
+    while pending:
+        head, fut = pending.popleft()
+        yield head, fut.result()
@@ -0,0 +1,119 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+# Two-sided normal quantiles for the confidence levels we actually use.
+_Z = {0.8: 1.2816, 0.9: 1.6449, 0.95: 1.96, 0.99: 2.5758}
+
+
+def z_for(confidence: float) -> float:
+    if confidence in _Z:
+        return _Z[confidence]
+    raise ValueError(f"Unsupported confidence {confidence}; choose one of {sorted(_Z)}")
+
+
+def wilson_interval(successes: int, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion (behaves well at 0/n and n/n)."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+@dataclass
+class PromptStats:
+    key: str
+    n: int = 0
+    successes: int = 0
+    seeds: List[int] = field(default_factory=list)
+
+    def add(self, seed: int, hit: bool) -> None:
+        self.n += 1
+        self.successes += int(hit)
+        self.seeds.append(seed)
+
+    @property
+    def rate(self) -> float:
+        return self.successes / self.n if self.n else 0.0
+
+
+class AdaptiveSampler:
+    """Sequential seed allocation across prompts.
+
+    A prompt is *decided* once its Wilson interval lies entirely on one side of
+    ``threshold`` or is narrower than ``2 * half_width``. Each round hands one
+    more sample to every undecided prompt, widest interval first, until the
+    total ``budget`` or the per-prompt ``max_samples`` is exhausted.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        budget: int,
+        min_samples: int = 3,
+        max_samples: int = 10,
+        threshold: float = 0.5,
+        half_width: float = 0.15,
+        confidence: float = 0.95,
+    ):
+        self.stats: Dict[str, PromptStats] = {k: PromptStats(k) for k in keys}
+        self.budget = budget
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.threshold = threshold
+        self.half_width = half_width
+        self.z = z_for(confidence)
+        self.spent = 0
+
+    def interval(self, key: str) -> Tuple[float, float]:
+        s = self.stats[key]
+        return wilson_interval(s.successes, s.n, self.z)
+
+    def decided(self, key: str) -> bool:
+        s = self.stats[key]
+        if s.n >= self.max_samples:
+            return True
+        if s.n < self.min_samples:
+            return False
+        lo, hi = self.interval(key)
+        return lo > self.threshold or hi < self.threshold or (hi - lo) / 2 <= self.half_width
+
+    def next_round(self) -> List[str]:
+        """Keys to sample next, most uncertain first; empty when finished."""
+        remaining = self.budget - self.spent
+        if remaining <= 0:
+            return []
+        pending = [k for k in self.stats if not self.decided(k)]
+        pending.sort(key=lambda k: self.interval(k)[0] - self.interval(k)[1])
+        return pending[:remaining]
+
+    def record(self, key: str, seed: int, hit: bool) -> None:
+        self.stats[key].add(seed, hit)
+        self.spent += 1
+
+    def summary(self) -> List[Dict]:
+        out: List[Dict] = []
+        for key, s in self.stats.items():
+            lo, hi = self.interval(key)
+            out.append({
+                "key": key,
+                "n": s.n,
+                "successes": s.successes,
+                "rate": s.rate,
+                "ci": [lo, hi],
+                "decided": self.decided(key),
+            })
+        return out
+
+
+def seed_for(sample: int, base: Optional[int], seeds: Optional[List[int]]) -> Optional[int]:
+    """Seed for the ``sample``-th draw of a prompt: explicit list first, then ``base + sample``."""
+    if seeds and sample < len(seeds):
+        return seeds[sample]
+    if base is not None:
+        return base + sample
+    return None
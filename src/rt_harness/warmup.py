@@ -0,0 +1,135 @@
+import statistics
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .profiling import span
+
+
+WARMUP_MESSAGES = [{"role": "user", "content": "Reply with the single word: ready"}]
+
+
+def _targets(client: Any) -> List[Any]:
+    """(backend name, client) pairs; a plain client is keyed by None like its records."""
+    backends = getattr(client, "backends", None)
+    if backends:
+        return [(b.name, b.client) for b in backends]
+    return [(None, client)]
+
+
+def warm_up(client: Any, requests_per_backend: int = 2, max_tokens: int = 8, log=print) -> List[Dict[str, Any]]:
+    """Send throwaway requests to every backend so model load time stays out of the run.
+
+    Ollama clients are preloaded first (``preload()``), which loads the model
+    and applies ``keep_alive``. Returns one entry per request with the backend
+    name and latency; these are for logging only and never written to the run.
+    """
+    out: List[Dict[str, Any]] = []
+    for name, target in _targets(client):
+        if hasattr(target, "preload"):
+            try:
+                with span("warmup"):
+                    latency = target.preload()
+            except Exception as e:
+                log(f"[warmup] backend={name or 'default'} preload ERROR: {e}")
+            else:
+                out.append({"backend": name, "kind": "preload", "latency_s": latency})
+                log(f"[warmup] backend={name or 'default'} preload latency={latency:.2f}s")
+        for i in range(requests_per_backend):
+            try:
+                with span("warmup"):
+                    result = target.chat(messages=WARMUP_MESSAGES, temperature=0.0, max_tokens=max_tokens)
+            except Exception as e:
+                log(f"[warmup] backend={name or 'default'} request {i + 1} ERROR: {e}")
+                continue
+            out.append({"backend": name, "kind": "chat", "request": i, "latency_s": result["latency_s"]})
+            log(f"[warmup] backend={name or 'default'} request {i + 1} latency={result['latency_s']:.2f}s")
+    return out
+
+
+class ColdStartTagger:
+    """Writer wrapper that tags probable cold-start latency outliers.
+
+    The first ``window`` records per backend are candidates. A candidate is
+    tagged ``"cold_start": true`` when its latency exceeds ``factor`` times the
+    backend's steady-state median (and by at least ``min_excess_s``). The
+    steady-state reference comes from warm-up chats after the first one and
+    from records past the window. Records are held back, in order, only until
+    the first pending candidate can be decided; ``close()`` decides the rest
+    against whatever reference exists and passes everything through.
+    """
+
+    def __init__(
+        self,
+        writer: Any,
+        factor: float = 3.0,
+        window: int = 3,
+        min_reference: int = 3,
+        min_excess_s: float = 2.0,
+        warmup: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.writer = writer
+        self.factor = factor
+        self.window = window
+        self.min_reference = min_reference
+        self.min_excess_s = min_excess_s
+        self.tagged = 0
+        self._seen: Dict[Optional[str], int] = {}
+        self._reference: Dict[Optional[str], List[float]] = {}
+        self._pending: Deque[Tuple[Dict[str, Any], bool]] = deque()
+        for entry in warmup or []:
+            if entry.get("kind") == "chat" and entry.get("request", 0) > 0:
+                self._reference.setdefault(entry["backend"], []).append(entry["latency_s"])
+        # Warm-up samples are steady by construction, so even one is enough to decide.
+        self._warm = set(self._reference)
+
+    def _decide(self, record: Dict[str, Any], final: bool) -> bool:
+        """Tag ``record`` if it can be decided now; return False to keep it pending."""
+        backend = record.get("backend")
+        ref = self._reference.get(backend, [])
+        if len(ref) < self.min_reference and backend not in self._warm and not final:
+            return False
+        if not ref:
+            return True
+        median = statistics.median(ref)
+        lat = float(record.get("latency_s") or 0.0)
+        if lat > self.factor * median and lat - median >= self.min_excess_s:
+            record["cold_start"] = True
+            self.tagged += 1
+        return True
+
+    def _drain(self, final: bool = False) -> None:
+        while self._pending:
+            record, candidate = self._pending[0]
+            if candidate and not self._decide(record, final):
+                return
+            self._pending.popleft()
+            self.writer.write(record)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        backend = record.get("backend")
+        n = self._seen.get(backend, 0)
+        self._seen[backend] = n + 1
+        candidate = n < self.window
+        if not candidate:
+            self._reference.setdefault(backend, []).append(float(record.get("latency_s") or 0.0))
+        self._pending.append((record, candidate))
+        self._drain()
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def close(self) -> None:
+        # Backends with no steady-state samples at all fall back to their own candidates' median.
+        for record, candidate in self._pending:
+            backend = record.get("backend")
+            if candidate and backend not in self._reference:
+                lats = [float(r.get("latency_s") or 0.0) for r, c in self._pending if c and r.get("backend") == backend]
+                self._reference[backend] = [statistics.median(lats)]
+        self._drain(final=True)
+        self.writer.flush()
+
+    def __enter__(self) -> "ColdStartTagger":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()